@@ -2,15 +2,19 @@ import streamlit as st
 from dotenv import load_dotenv
 from PyPDF2 import PdfReader
 from langchain.text_splitter import CharacterTextSplitter
-from langchain.embeddings import OpenAIEmbeddings, HuggingFaceInstructEmbeddings
+from langchain.embeddings import OpenAIEmbeddings, HuggingFaceInstructEmbeddings, HuggingFaceEmbeddings
 from langchain.vectorstores import FAISS
 from langchain.chat_models import ChatOpenAI
 from langchain_groq import ChatGroq
 from langchain.memory import ConversationBufferMemory
 from langchain.chains import ConversationalRetrievalChain
-from htmlTemplates import css, bot_template, user_template
+from langchain.callbacks.base import BaseCallbackHandler
+from htmlTemplates import css, bot_template, user_template, latency_template
 from langchain.llms import HuggingFaceHub
 import docx2txt
+import hashlib
+import os
+import time
 def get_pdf_text(docs):
     text = ""
     for pdf in docs:
@@ -21,8 +25,8 @@ def get_pdf_text(docs):
 
 def get_word_text(docs):
     text = ""
-    for doc in docs:    
-        text = docx2txt.process(doc)
+    for doc in docs:
+        text += docx2txt.process(doc) + "\n"
     return text
     
 
@@ -37,38 +41,150 @@ def get_text_chunks(text):
     return chunks
 
 
+# The embedding model and LLM clients are process-wide resources shared by
+# every rerun and every user session
+@st.cache_resource(show_spinner="Loading embedding model...")
+def get_embeddings():
+    # EMBEDDING_BACKEND selects instructor-xl (default) or a lighter
+    # sentence-transformers model; EMBEDDING_MODEL overrides the model id
+    backend = os.environ.get("EMBEDDING_BACKEND", "instructor")
+    model_name = os.environ.get("EMBEDDING_MODEL")
+    if backend == "sentence-transformers":
+        return HuggingFaceEmbeddings(
+            model_name=model_name or "sentence-transformers/all-MiniLM-L6-v2",
+            encode_kwargs={"normalize_embeddings": True})
+    return HuggingFaceInstructEmbeddings(model_name=model_name or "hkunlp/instructor-xl")
+
+
 def get_vectorstore(text_chunks):
     #embeddings = OpenAIEmbeddings()
-    embeddings = HuggingFaceInstructEmbeddings(model_name="hkunlp/instructor-xl")
+    embeddings = get_embeddings()
     vectorstore = FAISS.from_texts(texts=text_chunks, embedding=embeddings)
     return vectorstore
 
 
+def get_docs_hash(docs):
+    # Order-independent digest of the uploaded files' contents
+    digests = sorted(hashlib.sha256(doc.getvalue()).hexdigest() for doc in docs)
+    return hashlib.sha256("".join(digests).encode()).hexdigest()
+
+
+# Indexes are shared by document set: users uploading the same files reuse
+# one vectorstore instead of each paying for extraction and embedding
+@st.cache_resource(show_spinner=False, max_entries=int(os.environ.get("VECTORSTORE_CACHE_SIZE", 16)))
+def get_cached_vectorstore(docs_hash, _docs):
+    # get pdf text
+    #raw_text = get_pdf_text(_docs)
+    raw_text = get_word_text(_docs)
+
+    # get the text chunks
+    text_chunks = get_text_chunks(raw_text)
+
+    # create vector store
+    return get_vectorstore(text_chunks)
+
+
+@st.cache_resource(show_spinner=False)
+def get_llms():
+    # The answering model streams its tokens; rewriting follow-up questions
+    # into standalone ones uses a separate, non-streaming client
+    llm = ChatGroq(model='llama3-70b-8192', temperature=0.5, streaming=True, tags=["answer"])
+    condense_question_llm = ChatGroq(model='llama3-70b-8192', temperature=0)
+    return llm, condense_question_llm
+
+
+class StreamHandler(BaseCallbackHandler):
+    """
+    Streams answer tokens into a placeholder and records per-turn latency.
+    Only runs of the LLM tagged "answer" are streamed, so the question
+    rewriting step of the chain does not show up in the chat.
+    """
+
+    def __init__(self, placeholder):
+        self.placeholder = placeholder
+        self.text = ""
+        self.answer_runs = set()
+        self.start = time.perf_counter()
+        self.retrieval_start = None
+        self.retrieval_seconds = None
+        self.generation_start = None
+        self.first_token_seconds = None
+        self.generation_seconds = None
+
+    def _start_llm(self, run_id, tags):
+        if tags and "answer" in tags:
+            self.answer_runs.add(run_id)
+            self.generation_start = time.perf_counter()
+
+    def on_llm_start(self, serialized, prompts, *, run_id, tags=None, **kwargs):
+        self._start_llm(run_id, tags)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, tags=None, **kwargs):
+        self._start_llm(run_id, tags)
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if run_id not in self.answer_runs:
+            return
+        if self.first_token_seconds is None:
+            self.first_token_seconds = time.perf_counter() - self.generation_start
+        self.text += token
+        self.placeholder.write(bot_template.replace("{{MSG}}", self.text + "▌"), unsafe_allow_html=True)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        if run_id in self.answer_runs:
+            self.generation_seconds = time.perf_counter() - self.generation_start
+
+    def on_retriever_start(self, serialized, query, **kwargs):
+        self.retrieval_start = time.perf_counter()
+
+    def on_retriever_end(self, documents, **kwargs):
+        self.retrieval_seconds = time.perf_counter() - self.retrieval_start
+
+    def latency_summary(self):
+        parts = []
+        if self.retrieval_seconds is not None:
+            parts.append(f"retrieval {self.retrieval_seconds:.2f}s")
+        if self.first_token_seconds is not None:
+            parts.append(f"first token {self.first_token_seconds:.2f}s")
+        if self.generation_seconds is not None:
+            parts.append(f"generation {self.generation_seconds:.2f}s")
+        parts.append(f"total {time.perf_counter() - self.start:.2f}s")
+        return " · ".join(parts)
+
+
 def get_conversation_chain(vectorstore):
     #llm = ChatOpenAI()
     # llm = HuggingFaceHub(repo_id="google/flan-t5-xxl", model_kwargs={"temperature":0.5, "max_length":512})
-    llm = ChatGroq(model='llama3-70b-8192', temperature=0.5)
+    llm, condense_question_llm = get_llms()
+    # Memory is per session; the LLM clients and vectorstore may be shared
     memory = ConversationBufferMemory(
         memory_key='chat_history', return_messages=True)
     conversation_chain = ConversationalRetrievalChain.from_llm(
         llm=llm,
+        condense_question_llm=condense_question_llm,
         retriever=vectorstore.as_retriever(),
         memory=memory
     )
     return conversation_chain
 
 
+def render_message(template, content):
+    # Messages are templated once and cached, so later turns only pay for the new ones
+    html = template.replace("{{MSG}}", content)
+    st.session_state.rendered_messages.append(html)
+    return html
+
+
 def handle_userinput(user_question):
-    response = st.session_state.conversation({'question': user_question})
-    st.session_state.chat_history = response['chat_history']
+    st.write(render_message(user_template, user_question), unsafe_allow_html=True)
 
-    for i, message in enumerate(st.session_state.chat_history):
-        if i % 2 == 0:
-            st.write(user_template.replace(
-                "{{MSG}}", message.content), unsafe_allow_html=True)
-        else:
-            st.write(bot_template.replace(
-                "{{MSG}}", message.content), unsafe_allow_html=True)
+    placeholder = st.empty()
+    handler = StreamHandler(placeholder)
+    response = st.session_state.conversation({'question': user_question}, callbacks=[handler])
+
+    # The latency caption is cached with the answer so every turn keeps its own
+    placeholder.write(render_message(bot_template, response['answer'])
+                      + render_message(latency_template, handler.latency_summary()), unsafe_allow_html=True)
 
 
 def main():
@@ -79,13 +195,24 @@ def main():
 
     if "conversation" not in st.session_state:
         st.session_state.conversation = None
-    if "chat_history" not in st.session_state:
-        st.session_state.chat_history = None
+    if "rendered_messages" not in st.session_state:
+        st.session_state.rendered_messages = []
 
     st.header("Chat with Documents")
-    user_question = st.text_input("Ask a question about your documents:")
-    if user_question:
-        handle_userinput(user_question)
+    # A form answers once per submit, so asking the same question again works
+    with st.form("question", clear_on_submit=True):
+        user_question = st.text_input("Ask a question about your documents:")
+        submitted = st.form_submit_button("Ask")
+
+    # Earlier turns are drawn from their cached HTML in a single write
+    if st.session_state.rendered_messages:
+        st.write("".join(st.session_state.rendered_messages), unsafe_allow_html=True)
+
+    if submitted and user_question:
+        if st.session_state.conversation is None:
+            st.warning("Upload your documents and click on 'Process' first.")
+        else:
+            handle_userinput(user_question)
 
     with st.sidebar:
         st.subheader("Your documents")
@@ -93,15 +220,8 @@ def main():
             "Upload your document here and click on 'Process'", accept_multiple_files=True)
         if st.button("Process"):
             with st.spinner("Processing"):
-                # get pdf text
-                #raw_text = get_pdf_text(docs)
-                raw_text = get_word_text(docs)
-
-                # get the text chunks
-                text_chunks = get_text_chunks(raw_text)
-
-                # create vector store
-                vectorstore = get_vectorstore(text_chunks)
+                # get (or reuse) the vector store for this set of documents
+                vectorstore = get_cached_vectorstore(get_docs_hash(docs), docs)
 
                 # create conversation chain
                 st.session_state.conversation = get_conversation_chain(
@@ -23,6 +23,11 @@ css = '''
   padding: 0 1.5rem;
   color: #fff;
 }
+.latency {
+  margin: -0.75rem 0 1rem;
+  font-size: 0.8rem;
+  color: #808495;
+}
 '''
 
 bot_template = '''
@@ -42,3 +47,7 @@ user_template = '''
     <div class="message">{{MSG}}</div>
 </div>
 '''
+
+latency_template = '''
+<div class="latency">{{MSG}}</div>
+'''
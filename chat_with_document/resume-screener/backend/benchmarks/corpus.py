@@ -0,0 +1,162 @@
+"""
+Synthetic resume corpus generator.
+
+Writes minimal but valid PDF and DOCX files using only the standard
+library, so corpora of any size can be produced without office tooling.
+"""
+import os
+import random
+import zipfile
+from typing import Dict, List
+from xml.sax.saxutils import escape
+
+SKILLS = [
+    "Python", "Java", "SQL", "PySpark", "Spark", "Hadoop", "Hive", "Kafka", "Airflow",
+    "AWS", "Azure", "GCP", "Docker", "Kubernetes", "Terraform", "React", "Node.js",
+    "REST APIs", "Git", "Scala", "Databricks", "Snowflake", "Pandas", "NumPy",
+    "Machine Learning", "TensorFlow", "PyTorch", "Tableau", "Power BI", "Linux",
+]
+TITLES = ["Data Engineer", "Software Engineer", "Data Scientist", "Backend Developer",
+          "Cloud Engineer", "Analytics Engineer"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+DEGREES = ["B.Tech in Computer Science", "M.Sc in Data Science", "B.E. in Electronics",
+           "MBA in Information Systems"]
+FIRST_NAMES = ["Asha", "Ravi", "Meera", "Arjun", "Priya", "Kiran", "Sanjay", "Neha"]
+LAST_NAMES = ["Rao", "Sharma", "Iyer", "Patel", "Reddy", "Nair", "Gupta", "Das"]
+
+SAMPLE_JOB_DESCRIPTION = """Senior Data Engineer
+
+Responsibilities:
+- Build and maintain batch and streaming data pipelines
+- Collaborate with analysts and data scientists
+
+Requirements:
+- 5+ years of experience in data engineering
+- Strong Python and SQL skills
+- Hands-on experience with PySpark and Databricks
+- Experience with AWS or Azure cloud services
+- Familiarity with Airflow and Kafka
+"""
+
+def resume_lines(rng: random.Random, index: int, experience_entries: int = 3) -> List[str]:
+    """Build the text lines of one synthetic resume"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    skills = rng.sample(SKILLS, rng.randint(5, 12))
+    lines = [
+        name,
+        f"{name.lower().replace(' ', '.')}{index}@example.com | +1 555 {index % 1000:03d} {rng.randint(1000, 9999)}",
+        "",
+        "Summary:",
+        f"{rng.choice(TITLES)} with {rng.randint(1, 15)} years of experience building data platforms.",
+        "",
+        "Skills:",
+    ]
+    # One bullet line per few skills, the layout extract_structured_resume_data expects
+    for i in range(0, len(skills), 4):
+        lines.append("• " + ", ".join(skills[i:i + 4]))
+    lines += [
+        "",
+        "Experience:",
+    ]
+    for _ in range(experience_entries):
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({rng.randint(2010, 2024)})")
+        for skill in rng.sample(skills, min(3, len(skills))):
+            lines.append(f"- Delivered production workloads using {skill} for analytics teams")
+    lines += ["", "Education:", rng.choice(DEGREES)]
+    return lines
+
+def write_pdf(path: str, lines: List[str]) -> None:
+    """Write lines as a single-page PDF with a text content stream"""
+    def pdf_escape(text: str) -> str:
+        text = text.encode("cp1252", "replace").decode("latin-1")
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    content = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+    for line in lines:
+        content.append(f"({pdf_escape(line)}) Tj T*")
+    content.append("ET")
+    stream = "\n".join(content).encode("latin-1")
+
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+        b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n").encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+def write_docx(path: str, lines: List[str]) -> None:
+    """
+    Write lines to a minimal DOCX package. Blank lines separate paragraphs and
+    the lines within a paragraph are joined with line breaks, which keeps the
+    extracted text laid out like the PDF variant.
+    """
+    blocks: List[List[str]] = [[]]
+    for line in lines:
+        if line:
+            blocks[-1].append(line)
+        elif blocks[-1]:
+            blocks.append([])
+    paragraphs = "".join(
+        "<w:p><w:r>"
+        + "<w:br/>".join(f'<w:t xml:space="preserve">{escape(line)}</w:t>' for line in block)
+        + "</w:r></w:p>"
+        for block in blocks if block
+    )
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{paragraphs}</w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        z.writestr("_rels/.rels", DOCX_RELS)
+        z.writestr("word/document.xml", document)
+
+def generate_corpus(out_dir: str, count: int, formats: List[str] = None, seed: int = 42) -> List[Dict[str, str]]:
+    """
+    Generate count resumes in out_dir, alternating between the given formats.
+    Returns a list of {"filename", "path"} entries.
+    """
+    formats = formats or ["pdf", "docx"]
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+
+    files = []
+    for i in range(count):
+        fmt = formats[i % len(formats)]
+        filename = f"resume_{i:05d}.{fmt}"
+        path = os.path.join(out_dir, filename)
+        lines = resume_lines(rng, i)
+        if fmt == "pdf":
+            write_pdf(path, lines)
+        else:
+            write_docx(path, lines)
+        files.append({"filename": filename, "path": path})
+    return files
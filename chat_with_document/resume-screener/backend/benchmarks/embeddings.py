@@ -0,0 +1,131 @@
+"""
+Quality versus throughput comparison of embedding backends.
+
+Every backend ranks the same resumes against a job description. The first
+backend is the reference: the others report how closely their ranking
+agrees with it (Spearman correlation and top-k overlap) alongside load
+time and embedding throughput.
+
+Usage (from the backend directory):
+    python -m benchmarks.embeddings --backends instructor sentence-transformers onnx
+    python -m benchmarks.embeddings --backends instructor onnx:BAAI/bge-small-en-v1.5 \\
+        --resume-dir temp_uploads/some-session
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.corpus import SAMPLE_JOB_DESCRIPTION, generate_corpus
+from benchmarks.fakes import FakeEmbeddings
+from document_processor import extract_text_from_resume
+from embedding_backends import load_embeddings
+
+def load_texts(args: argparse.Namespace) -> List[Tuple[str, str]]:
+    """Return (filename, text) pairs from --resume-dir or a synthetic corpus"""
+    if args.resume_dir:
+        paths = sorted(
+            os.path.join(args.resume_dir, name) for name in os.listdir(args.resume_dir)
+            if name.endswith(".pdf") or name.endswith(".docx")
+        )
+        return [(os.path.basename(p), extract_text_from_resume(p)) for p in paths]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        files = generate_corpus(work_dir, args.count, seed=args.seed)
+        return [(f["filename"], extract_text_from_resume(f["path"])) for f in files]
+
+def load_backend(spec: str):
+    """Load a backend from a "backend[:model]" spec; "fake" needs no downloads"""
+    backend, _, model_name = spec.partition(":")
+    if backend == "fake":
+        return FakeEmbeddings()
+    return load_embeddings(backend, model_name or None)
+
+def rank(scores: np.ndarray) -> np.ndarray:
+    ranks = np.empty(len(scores))
+    ranks[np.argsort(scores)] = np.arange(len(scores))
+    return ranks
+
+def spearman(a: np.ndarray, b: np.ndarray) -> float:
+    if len(a) < 2:
+        return 1.0
+    return float(np.corrcoef(rank(a), rank(b))[0, 1])
+
+def top_k_overlap(a: np.ndarray, b: np.ndarray, k: int) -> float:
+    k = min(k, len(a))
+    return len(set(np.argsort(-a)[:k]) & set(np.argsort(-b)[:k])) / k if k else 1.0
+
+def benchmark_backend(spec: str, job_description: str, texts: List[str]) -> Dict[str, Any]:
+    start = time.perf_counter()
+    model = load_backend(spec)
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    doc_vectors = np.asarray(model.embed_documents(texts), dtype=np.float32)
+    embed_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    jd_vector = np.asarray(model.embed_query(job_description), dtype=np.float32)
+    query_seconds = time.perf_counter() - start
+
+    doc_vectors /= np.clip(np.linalg.norm(doc_vectors, axis=1, keepdims=True), 1e-12, None)
+    jd_vector /= max(float(np.linalg.norm(jd_vector)), 1e-12)
+
+    return {
+        "backend": spec,
+        "dimension": int(doc_vectors.shape[1]),
+        "load_seconds": load_seconds,
+        "embed_seconds": embed_seconds,
+        "docs_per_second": len(texts) / embed_seconds if embed_seconds else 0.0,
+        "query_seconds": query_seconds,
+        "scores": (doc_vectors @ jd_vector).tolist(),
+    }
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare embedding backends on sample resumes")
+    parser.add_argument("--backends", nargs="+", default=["instructor", "sentence-transformers", "onnx"],
+                        help='Backend specs as "backend[:model]"; the first one is the quality reference')
+    parser.add_argument("--resume-dir", help="Directory of PDF/DOCX resumes (default: synthetic corpus)")
+    parser.add_argument("--count", type=int, default=50, help="Synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--jd-file", help="Job description text file (default: built-in sample)")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--output", help="Write results JSON to this path")
+    args = parser.parse_args(argv)
+
+    job_description = SAMPLE_JOB_DESCRIPTION
+    if args.jd_file:
+        with open(args.jd_file, encoding="utf-8") as f:
+            job_description = f.read()
+    filenames, texts = zip(*load_texts(args))
+    print(f"Embedding {len(texts)} resumes with {len(args.backends)} backend(s)")
+
+    results = [benchmark_backend(spec, job_description, list(texts)) for spec in args.backends]
+    reference = np.asarray(results[0]["scores"])
+    for result in results:
+        scores = np.asarray(result["scores"])
+        result["spearman_vs_reference"] = spearman(scores, reference)
+        result["top_k_overlap_vs_reference"] = top_k_overlap(scores, reference, args.top_k)
+
+    print(f"{'backend':<40} {'dim':>5} {'load s':>8} {'docs/s':>9} {'spearman':>9} {'top-k':>6}")
+    for r in results:
+        print(f"{r['backend']:<40} {r['dimension']:>5} {r['load_seconds']:>8.2f} {r['docs_per_second']:>9.1f} "
+              f"{r['spearman_vs_reference']:>9.3f} {r['top_k_overlap_vs_reference']:>6.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"reference": args.backends[0], "filenames": list(filenames), "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
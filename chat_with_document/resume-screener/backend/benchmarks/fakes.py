@@ -0,0 +1,101 @@
+"""
+Deterministic stand-ins for ChatGroq and the embedding model.
+
+They expose the same methods the screening engine calls, return stable
+outputs derived from a hash of their input, and sleep for a configurable
+time so benchmarks can model provider latency without network access.
+"""
+import hashlib
+import math
+import re
+import time
+from typing import List
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#.]+")
+
+def _stable_hash(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+class FakeMessage:
+    """Mimics the AIMessage returned by chat models"""
+
+    def __init__(self, content: str, input_tokens: int, output_tokens: int):
+        self.content = content
+        self.usage_metadata = {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+class FakeChatGroq:
+    """
+    Fake chat model answering skill-match and summary prompts.
+
+    A requirement is reported as matched when any of its words appear in the
+    candidate skills listed in the prompt, so results track the corpus.
+    """
+
+    def __init__(self, latency_ms: float = 0.0, fail_rate: float = 0.0):
+        self.latency = latency_ms / 1000.0
+        self.fail_rate = fail_rate
+        self.calls = 0
+
+    def invoke(self, prompt: str, **kwargs) -> FakeMessage:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if self.fail_rate and (_stable_hash(prompt) % 1000) / 1000.0 < self.fail_rate:
+            raise RuntimeError("Simulated LLM failure")
+
+        if "Job Requirement:" in prompt:
+            content = self._skill_match(prompt)
+        else:
+            content = ("The candidate shows relevant experience for the role. "
+                       "Several key requirements are covered. Some gaps remain.")
+        return FakeMessage(content, len(prompt) // 4, len(content) // 4)
+
+    def predict(self, prompt: str, **kwargs) -> str:
+        return self.invoke(prompt).content
+
+    def _skill_match(self, prompt: str) -> str:
+        requirement = re.search(r"Job Requirement:\s*(.*)", prompt)
+        skills = re.search(r"Candidate Skills:\s*(.*?)\n\s*\n", prompt, re.DOTALL)
+        req_words = set(TOKEN_PATTERN.findall((requirement.group(1) if requirement else "").lower()))
+        skill_words = set(TOKEN_PATTERN.findall((skills.group(1) if skills else "").lower()))
+        overlap = req_words & skill_words
+        confidence = 80 if overlap else 20
+        return (f"Matched: {'Yes' if overlap else 'No'}\n"
+                f"Confidence: {confidence}\n"
+                f"Explanation: Overlapping terms: {', '.join(sorted(overlap)) or 'none'}.")
+
+class FakeEmbeddings:
+    """
+    Fake embedding model using hashed bag-of-words vectors, so texts that
+    share vocabulary get a higher cosine similarity
+    """
+
+    def __init__(self, dimension: int = 768, latency_ms: float = 0.0, per_doc_latency_ms: float = 0.0):
+        self.dimension = dimension
+        self.latency = latency_ms / 1000.0
+        self.per_doc_latency = per_doc_latency_ms / 1000.0
+        self.calls = 0
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            h = _stable_hash(token)
+            vector[h % self.dimension] += 1.0 if (h >> 32) & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_query(self, text: str) -> List[float]:
+        self.calls += 1
+        if self.latency or self.per_doc_latency:
+            time.sleep(self.latency + self.per_doc_latency)
+        return self._embed(text)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls += 1
+        if self.latency or self.per_doc_latency:
+            time.sleep(self.latency + self.per_doc_latency * len(texts))
+        return [self._embed(text) for text in texts]
@@ -0,0 +1,194 @@
+"""
+Offline benchmark for the screening pipeline.
+
+Runs extraction, screen_resumes and report generation over synthetic
+corpora using the fake LLM and embedder, then writes the measurements as
+JSON and optionally compares them with a stored baseline.
+
+Usage (from the backend directory):
+    python -m benchmarks.run --sizes 10 100 1000 --llm-latency-ms 20
+    python -m benchmarks.run --sizes 100 --save-baseline
+    python -m benchmarks.run --sizes 100 --baseline benchmarks/baselines/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.corpus import SAMPLE_JOB_DESCRIPTION, generate_corpus
+from benchmarks.fakes import FakeChatGroq, FakeEmbeddings
+from document_processor import extract_text_from_resume
+import llm_guard
+from metrics import collect_timings
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "baseline.json")
+
+@contextmanager
+def measure(trace_memory: bool):
+    """Measure wall time and (optionally) peak Python heap usage of a block"""
+    stats: Dict[str, float] = {}
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats["seconds"] = time.perf_counter() - start
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            stats["peak_mb"] = peak / (1024 * 1024)
+
+def run_stage(name: str, count: int, fn: Callable[[], Any], trace_memory: bool) -> Dict[str, Any]:
+    with collect_timings() as breakdown, measure(trace_memory) as stats:
+        result = fn()
+    stats["docs_per_second"] = count / stats["seconds"] if stats["seconds"] else 0.0
+    stats["stages"] = breakdown
+    print(f"  {name:<16} {stats['seconds']:8.3f}s  {stats['docs_per_second']:9.1f} docs/s"
+          + (f"  peak {stats['peak_mb']:.1f} MB" if "peak_mb" in stats else ""))
+    return {"stats": stats, "result": result}
+
+def benchmark_size(size: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """Benchmark every stage on a freshly generated corpus of the given size"""
+    from screening_engine import screen_resumes
+    from report_generator import generate_report
+
+    print(f"Corpus of {size} resumes")
+    with tempfile.TemporaryDirectory() as work_dir:
+        files = generate_corpus(os.path.join(work_dir, "resumes"), size, args.formats, seed=args.seed)
+
+        extraction = run_stage("extraction", size, lambda: [
+            {"filename": f["filename"], "text": extract_text_from_resume(f["path"])} for f in files
+        ], args.trace_memory)
+        resumes_data = extraction["result"]
+
+        llm = FakeChatGroq(latency_ms=args.llm_latency_ms)
+        embeddings = FakeEmbeddings(dimension=args.embedding_dim, latency_ms=args.embed_latency_ms)
+        def screen():
+            # Large corpora exceed the default LLM time budget; without this the
+            # rest of the run would silently measure the fallback path
+            with llm_guard.batch_budget(0):
+                return screen_resumes(SAMPLE_JOB_DESCRIPTION, resumes_data, embeddings_model=embeddings, llm=llm)
+        screening = run_stage("screen_resumes", size, screen, args.trace_memory)
+        results = screening["result"]
+        if results and "error" in results[0]:
+            raise RuntimeError(results[0]["error"])
+        degraded = sum(1 for r in results if r.get("degraded"))
+
+        report_path = os.path.join(work_dir, "report.pdf")
+        report = run_stage("report", size, lambda: generate_report(
+            results, SAMPLE_JOB_DESCRIPTION, report_path
+        ), args.trace_memory)
+
+        totals = {
+            "llm_calls": llm.calls,
+            "embedding_calls": embeddings.calls,
+        }
+
+    return {
+        "extraction": extraction["stats"],
+        "screen_resumes": screening["stats"],
+        "report": report["stats"],
+        "end_to_end_seconds": sum(s["stats"]["seconds"] for s in (extraction, screening, report)),
+        "calls": totals,
+        "degraded": degraded,
+    }
+
+def compare_with_baseline(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return a description of every stage that got slower or bigger than the baseline allows"""
+    regressions = []
+    if current["settings"] != baseline.get("settings"):
+        print("Warning: baseline was recorded with different settings; comparison may be misleading")
+    for size, stages in current["results"].items():
+        base_stages = baseline.get("results", {}).get(size)
+        if not base_stages:
+            continue
+        for stage in ("extraction", "screen_resumes", "report"):
+            for metric in ("seconds", "peak_mb"):
+                now = stages[stage].get(metric)
+                before = base_stages.get(stage, {}).get(metric)
+                if now is None or not before:
+                    continue
+                if now > before * (1 + tolerance):
+                    regressions.append(
+                        f"{size} resumes / {stage} / {metric}: {now:.3f} vs baseline {before:.3f} "
+                        f"(+{(now / before - 1) * 100:.0f}%)"
+                    )
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline screening pipeline benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100],
+                        help="Corpus sizes to benchmark (10 to 10000 resumes)")
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx"], choices=["pdf", "docx"])
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Artificial latency per LLM call")
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="Artificial latency per embedding call")
+    parser.add_argument("--embedding-dim", type=int, default=768)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", dest="trace_memory", action="store_false",
+                        help="Skip tracemalloc (faster, but no peak memory figures)")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--baseline", help="Compare against this baseline JSON")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE,
+                        help=f"Store results as the new baseline (default {DEFAULT_BASELINE})")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed slowdown or memory growth before a regression is reported")
+    args = parser.parse_args(argv)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "formats": args.formats,
+            "llm_latency_ms": args.llm_latency_ms,
+            "embed_latency_ms": args.embed_latency_ms,
+            "embedding_dim": args.embedding_dim,
+            "seed": args.seed,
+            "trace_memory": args.trace_memory,
+        },
+        "results": {},
+    }
+    for size in args.sizes:
+        report["results"][str(size)] = benchmark_size(size, args)
+
+    # Degraded results were produced without the LLM, so their timings are
+    # not comparable with a baseline (or with other sizes)
+    degraded = {size: stages["degraded"] for size, stages in report["results"].items() if stages["degraded"]}
+    for size, count in degraded.items():
+        print(f"{size} resumes: {count} results were screened in degraded mode")
+
+    for path in filter(None, [args.output, None if degraded else args.save_baseline]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {path}")
+    if degraded:
+        print("Run failed: it did not measure the LLM path throughout")
+        return 1
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
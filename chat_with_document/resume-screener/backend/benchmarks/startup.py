@@ -0,0 +1,151 @@
+"""
+Startup-time benchmark for the API.
+
+Each measurement runs in a fresh interpreter so module caches do not
+hide import costs:
+
+  * import_main          - importing main.py (heavy modules stay lazy)
+  * import_eager         - importing main.py plus the langchain, LLM client,
+                           sklearn and pandas modules the screening stack used
+                           to import at module level, i.e. what every cold
+                           start paid before lazy loading
+  * time_to_healthz      - launching uvicorn until /healthz answers
+  * time_to_readyz       - launching uvicorn until /readyz reports the models loaded
+
+Interpreters and servers run from a scratch directory, so the janitor and
+the app's storage never touch the backend's own uploads and reports.
+
+Usage (from the backend directory):
+    python -m benchmarks.startup --repeat 3 --output startup.json
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPETS = {
+    "import_main": "import main",
+    "import_eager": (
+        "import main, screening_engine, report_generator, langchain_groq, langchain_community.llms, "
+        "langchain_community.embeddings, sklearn.metrics.pairwise, pandas"
+    ),
+}
+
+def time_import(snippet: str, work_dir: str) -> float:
+    code = f"import time; t = time.perf_counter(); {snippet}; print(time.perf_counter() - t)"
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [BACKEND_DIR, os.environ.get("PYTHONPATH")])))
+    output = subprocess.run([sys.executable, "-c", code], cwd=work_dir, env=env, check=True,
+                            capture_output=True, text=True).stdout
+    return float(output.strip().splitlines()[-1])
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_for(url: str, deadline: float) -> Optional[float]:
+    """
+    Poll url until it returns 200, returning the time it happened.
+    Gives up early if /readyz reports that model loading failed.
+    """
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter()
+        except urllib.error.HTTPError as e:
+            try:
+                status = json.loads(e.read().decode("utf-8")).get("status")
+            except ValueError:
+                status = None
+            if status == "error":
+                print(f"{url} reported that model loading failed")
+                return None
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    return None
+
+def time_server(readiness_timeout: float, preload: bool, work_dir: str) -> Dict[str, Optional[float]]:
+    port = free_port()
+    env = dict(os.environ, PRELOAD_MODELS="true" if preload else "false")
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", BACKEND_DIR,
+         "--host", "127.0.0.1", "--port", str(port)],
+        cwd=work_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        healthy = wait_for(f"{base}/healthz", start + 60)
+        ready = wait_for(f"{base}/readyz", start + readiness_timeout) if preload else None
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+    return {
+        "time_to_healthz": healthy - start if healthy else None,
+        "time_to_readyz": ready - start if ready else None,
+    }
+
+def summarize(samples: List[Optional[float]]) -> Dict[str, Optional[float]]:
+    values = [s for s in samples if s is not None]
+    if not values:
+        return {"median": None, "min": None, "max": None, "failures": len(samples)}
+    return {"median": statistics.median(values), "min": min(values), "max": max(values),
+            "failures": len(samples) - len(values)}
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure API cold-start time")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--readiness-timeout", type=float, default=600.0,
+                        help="Seconds to wait for /readyz (model downloads can be slow)")
+    parser.add_argument("--skip-readiness", action="store_true",
+                        help="Do not preload models; only measure time to /healthz")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    args = parser.parse_args(argv)
+
+    samples: Dict[str, List[Optional[float]]] = {name: [] for name in IMPORT_SNIPPETS}
+    samples.update({"time_to_healthz": [], "time_to_readyz": []})
+
+    with tempfile.TemporaryDirectory(prefix="startup-bench-") as work_dir:
+        for i in range(args.repeat):
+            for name, snippet in IMPORT_SNIPPETS.items():
+                try:
+                    samples[name].append(time_import(snippet, work_dir))
+                except subprocess.CalledProcessError as e:
+                    print(f"{name} failed: {e.stderr.strip().splitlines()[-1] if e.stderr else e}")
+                    samples[name].append(None)
+            server = time_server(args.readiness_timeout, not args.skip_readiness, work_dir)
+            samples["time_to_healthz"].append(server["time_to_healthz"])
+            if not args.skip_readiness:
+                samples["time_to_readyz"].append(server["time_to_readyz"])
+            print(f"run {i + 1}/{args.repeat}: " + ", ".join(
+                f"{name}={values[-1]:.3f}s" if values and values[-1] is not None else f"{name}=n/a"
+                for name, values in samples.items() if values))
+
+    results = {name: summarize(values) for name, values in samples.items() if values}
+    print(f"{'measurement':<18} {'median s':>9} {'min s':>8} {'max s':>8}")
+    for name, stats in results.items():
+        if stats["median"] is None:
+            print(f"{name:<18} {'n/a':>9}")
+            continue
+        print(f"{name:<18} {stats['median']:>9.3f} {stats['min']:>8.3f} {stats['max']:>8.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
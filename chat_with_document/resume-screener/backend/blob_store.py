@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: blob access is only serialized within the process
+    fcntl = None
+
+# Uploaded resumes are stored once per unique content under their SHA-256
+# digest; sessions only hold a manifest referencing those blobs.
+BLOB_DIRNAME = "blobs"
+MANIFEST_FILENAME = "manifest.json"
+TEXT_SUFFIX = ".txt"
+CHUNK_SIZE = 1024 * 1024
+LOCK_FILENAME = ".lock"
+
+_blob_lock = threading.Lock()
+
+def blob_root(upload_dir: str) -> str:
+    """Return the directory that holds content-addressed blobs"""
+    return os.path.join(upload_dir, BLOB_DIRNAME)
+
+def blob_path(upload_dir: str, digest: str, extension: str) -> str:
+    """
+    Return the storage path for a blob, fanned out by the first two hex chars.
+    The extension is kept so extractors can dispatch on the file type.
+    """
+    return os.path.join(blob_root(upload_dir), digest[:2], f"{digest}{extension}")
+
+@contextmanager
+def blob_lock(upload_dir: str):
+    """
+    Serialize blob creation and refresh with the janitor's blob sweep, across
+    threads and worker processes, so a blob is never deleted while an upload
+    is deduplicating against it
+    """
+    root = blob_root(upload_dir)
+    os.makedirs(root, exist_ok=True)
+    with _blob_lock, open(os.path.join(root, LOCK_FILENAME), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def store_blob(upload_dir: str, fileobj: BinaryIO, extension: str) -> Dict[str, Any]:
+    """
+    Stream an uploaded file into the blob store.
+
+    The content is hashed while it is copied to a temporary file. If a blob
+    with the same digest already exists the temporary copy is discarded, so
+    a duplicate upload costs only the hash.
+    """
+    tmp_dir = blob_root(upload_dir)
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    sha = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+                sha.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+
+        digest = sha.hexdigest()
+        path = blob_path(upload_dir, digest, extension)
+        with blob_lock(upload_dir):
+            deduplicated = os.path.exists(path)
+            if deduplicated:
+                os.remove(tmp_path)
+                # Refresh the blob so the janitor treats it as recently used
+                os.utime(path, None)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return {"digest": digest, "path": path, "size": size, "deduplicated": deduplicated}
+
+def write_session_manifest(session_dir: str, files: List[Dict[str, Any]]) -> None:
+    """Write the list of blob references held by a session"""
+    os.makedirs(session_dir, exist_ok=True)
+    manifest_path = os.path.join(session_dir, MANIFEST_FILENAME)
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"files": files}, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+def read_session_manifest(session_dir: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Read the blob references held by a session.
+    Returns None if the session has no manifest.
+    """
+    manifest_path = os.path.join(session_dir, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f).get("files", [])
+
+def load_cached_text(blob_file: str) -> Optional[str]:
+    """Return previously extracted text stored next to a blob, if any"""
+    text_path = f"{blob_file}{TEXT_SUFFIX}"
+    if not os.path.exists(text_path):
+        return None
+    with open(text_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def save_cached_text(blob_file: str, text: str) -> None:
+    """Store extracted text next to its blob so it is parsed only once"""
+    text_path = f"{blob_file}{TEXT_SUFFIX}"
+    tmp_path = f"{text_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, text_path)
+
+def remove_blob(blob_file: str) -> int:
+    """Delete a blob and its cached text, returning the bytes reclaimed"""
+    reclaimed = 0
+    for path in (blob_file, f"{blob_file}{TEXT_SUFFIX}"):
+        if os.path.exists(path):
+            reclaimed += os.path.getsize(path)
+            os.remove(path)
+    return reclaimed
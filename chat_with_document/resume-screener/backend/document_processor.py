@@ -3,6 +3,12 @@ import docx2txt
 import re
 import os
 from typing import Dict, List, Any
+from blob_store import load_cached_text, save_cached_text
+from metrics import span, record_cache
+from singleflight import SingleFlight
+
+# Concurrent requests extracting the same blob share one extraction
+extraction_flight = SingleFlight("extraction")
 
 def extract_text_from_pdf(file_path: str) -> str:
     """
@@ -10,7 +16,7 @@ def extract_text_from_pdf(file_path: str) -> str:
     """
     text = ""
     try:
-        with open(file_path, 'rb') as file:
+        with span("extract_pdf"), open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
             for page in pdf_reader.pages:
                 text += page.extract_text() + "\n"
@@ -25,7 +31,8 @@ def extract_text_from_docx(file_path: str) -> str:
     Extract text content from a DOCX file
     """
     try:
-        text = docx2txt.process(file_path)
+        with span("extract_docx"):
+            text = docx2txt.process(file_path)
         return text
     except Exception as e:
         print(f"Error extracting text from DOCX: {e}")
@@ -42,6 +49,28 @@ def extract_text_from_resume(file_path: str) -> str:
     else:
         return "Unsupported file format. Please upload PDF or DOCX."
 
+def extract_text_from_blob(blob_file: str) -> str:
+    """
+    Extract text from a content-addressed resume blob, reusing the text
+    extracted by any earlier session that uploaded the same file
+    """
+    cached = load_cached_text(blob_file)
+    record_cache("extracted_text", cached is not None)
+    if cached is not None:
+        return cached
+    
+    # Blob paths are content hashes, so they key the in-flight extraction
+    text, _ = extraction_flight.do(blob_file, extract_and_cache_blob, blob_file)
+    return text
+
+def extract_and_cache_blob(blob_file: str) -> str:
+    """Extract a blob's text and store it next to the blob"""
+    text = extract_text_from_resume(blob_file)
+    # Only cache successful extractions so transient failures are retried
+    if not text.startswith(("Error processing", "Unsupported file format")):
+        save_cached_text(blob_file, text)
+    return text
+
 def extract_structured_resume_data(resume_text: str) -> Dict[str, Any]:
     """
     Extract structured data from resume text
@@ -99,6 +128,77 @@ def extract_structured_resume_data(resume_text: str) -> Dict[str, Any]:
     
     return sections
 
+# Headings that start a new resume section when they appear on their own line
+# (optionally followed by a colon and inline content, e.g. "Skills: Python, SQL")
+SECTION_HEADINGS = {
+    "summary", "profile", "objective", "about", "experience", "work experience",
+    "professional experience", "employment", "employment history", "education",
+    "skills", "technical skills", "core skills", "projects", "certifications",
+    "awards", "publications", "languages", "interests", "achievements"
+}
+BULLET_PATTERN = re.compile(r'^\s*(?:[•\-\*▪◦●]|\d+[.)])\s+')
+# Units are kept well below the embedding models' input limits
+UNIT_MAX_CHARS = int(os.environ.get("RESUME_UNIT_MAX_CHARS", 400))
+
+def _chunk_text(text: str, max_chars: int) -> List[str]:
+    """Split text into pieces of at most max_chars, breaking between words"""
+    chunks, current = [], ""
+    for word in text.split():
+        if current and len(current) + 1 + len(word) > max_chars:
+            chunks.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    if current:
+        chunks.append(current)
+    return chunks
+
+def split_resume_units(resume_text: str, max_chars: int = UNIT_MAX_CHARS) -> List[Dict[str, str]]:
+    """
+    Split resume text into section and bullet units for embedding.
+    Each bullet becomes its own unit; other consecutive lines are joined into
+    a paragraph unit. Every unit records the section it belongs to, and long
+    units are chunked to max_chars.
+    """
+    units: List[Dict[str, str]] = []
+    section = "header"
+    paragraph: List[str] = []
+    
+    def add(text: str) -> None:
+        for chunk in _chunk_text(text, max_chars):
+            units.append({"section": section, "text": chunk})
+    
+    def flush() -> None:
+        if paragraph:
+            add(" ".join(paragraph))
+            paragraph.clear()
+    
+    for raw_line in resume_text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            flush()
+            continue
+        
+        heading, _, inline = line.partition(":")
+        if heading.strip().lower() in SECTION_HEADINGS:
+            flush()
+            section = heading.strip().lower()
+            if inline.strip():
+                paragraph.append(inline.strip())
+            continue
+        
+        if BULLET_PATTERN.match(line):
+            flush()
+            add(BULLET_PATTERN.sub("", line))
+            continue
+        
+        paragraph.append(line)
+    flush()
+    
+    if not units and resume_text.strip():
+        add(resume_text)
+    return units
+
 def extract_text_from_jd(jd_text: str) -> Dict[str, Any]:
     """
     Process job description text to extract structured data
@@ -0,0 +1,202 @@
+import os
+import threading
+from typing import Dict, List, Optional
+
+# Embedding backend selection, configurable through environment variables:
+#   EMBEDDING_BACKEND = instructor | sentence-transformers | onnx
+#   EMBEDDING_MODEL   = model id or local path (defaults depend on the backend)
+#   EMBEDDING_SERVICE_URL = unix:///path/to.sock or http://host:port of a shared
+#                           embedding_service.py process; overrides the backend
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "instructor")
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL")
+EMBEDDING_CACHE_DIR = os.environ.get(
+    "EMBEDDING_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "resume-screener", "onnx"))
+EMBEDDING_SERVICE_URL = os.environ.get("EMBEDDING_SERVICE_URL")
+ONNX_QUANTIZE = os.environ.get("ONNX_QUANTIZE", "true").lower() in ("1", "true", "yes")
+
+DEFAULT_MODELS = {
+    "instructor": "hkunlp/instructor-xl",
+    "sentence-transformers": "sentence-transformers/all-MiniLM-L6-v2",
+    "onnx": "sentence-transformers/all-MiniLM-L6-v2",
+}
+
+# Used only when a model's dimension cannot be detected at all
+FALLBACK_DIMENSION = 768
+
+_dimensions: Dict[int, int] = {}
+_dimensions_lock = threading.Lock()
+
+class OnnxEmbeddings:
+    """
+    Sentence embeddings computed with ONNX Runtime on CPU.
+
+    The transformer is exported to ONNX once (and, by default, dynamically
+    quantized to int8 weights) and cached under EMBEDDING_CACHE_DIR.
+    Embeddings are mean-pooled over the attention mask and L2-normalized.
+    """
+
+    def __init__(self, model_name: str, cache_dir: str = EMBEDDING_CACHE_DIR,
+                 quantize: bool = ONNX_QUANTIZE, batch_size: int = 32, max_length: int = 512):
+        try:
+            import numpy as np
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError as e:
+            raise ImportError(
+                "The onnx embedding backend requires onnxruntime and transformers "
+                "(pip install onnxruntime transformers optimum[onnxruntime])"
+            ) from e
+
+        self._np = np
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+        model_path = self._prepare_model(model_name, cache_dir, quantize)
+        # model.onnx or model_int8.onnx: fp32 and quantized vectors must not mix
+        self.model_file = os.path.basename(model_path)
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(os.path.dirname(model_path))
+
+    @staticmethod
+    def _prepare_model(model_name: str, cache_dir: str, quantize: bool) -> str:
+        """Export (and quantize) the model on first use, returning the .onnx path"""
+        if model_name.endswith(".onnx") and os.path.exists(model_name):
+            return model_name
+
+        export_dir = os.path.join(cache_dir, model_name.replace("/", "__"))
+        fp32_path = os.path.join(export_dir, "model.onnx")
+        int8_path = os.path.join(export_dir, "model_int8.onnx")
+
+        if not os.path.exists(fp32_path):
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+
+            print(f"Exporting {model_name} to ONNX in {export_dir}...")
+            ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(export_dir)
+
+        if not quantize:
+            return fp32_path
+
+        if not os.path.exists(int8_path):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            print(f"Quantizing {model_name} to int8...")
+            quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+        return int8_path
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        np = self._np
+        encoded = self.tokenizer(texts, padding=True, truncation=True,
+                                 max_length=self.max_length, return_tensors="np")
+        inputs = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.tolist()
+
+    def identity(self) -> str:
+        return f"OnnxEmbeddings:{self.model_name}:{self.model_file}"
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        embeddings = []
+        for i in range(0, len(texts), self.batch_size):
+            embeddings.extend(self._embed_batch(texts[i:i + self.batch_size]))
+        return embeddings
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed_batch([text])[0]
+
+def load_embeddings(backend: Optional[str] = None, model_name: Optional[str] = None):
+    """
+    Load the configured embedding backend.
+    The returned object implements embed_query and embed_documents.
+    When EMBEDDING_SERVICE_URL is set and no backend is requested explicitly,
+    a client for the shared embedding service is returned instead.
+    """
+    if backend is None and EMBEDDING_SERVICE_URL:
+        from embedding_service import EmbeddingServiceClient
+        return EmbeddingServiceClient(EMBEDDING_SERVICE_URL)
+
+    backend = (backend or EMBEDDING_BACKEND).lower()
+    if backend not in DEFAULT_MODELS:
+        raise ValueError(f"Unknown embedding backend '{backend}' (expected one of {', '.join(DEFAULT_MODELS)})")
+    model_name = model_name or EMBEDDING_MODEL or DEFAULT_MODELS[backend]
+
+    if backend == "instructor":
+        from langchain_community.embeddings import HuggingFaceInstructEmbeddings
+        return HuggingFaceInstructEmbeddings(model_name=model_name)
+    if backend == "sentence-transformers":
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(model_name=model_name, encode_kwargs={"normalize_embeddings": True})
+    return OnnxEmbeddings(model_name)
+
+def embed_queries(embeddings_model, texts: List[str]) -> List[List[float]]:
+    """
+    Embed several queries in one model call where the backend allows it.
+    Instructor models prefix queries with their own instruction, symmetric
+    models embed queries and documents the same way, objects may define
+    embed_queries() (the shared embedding service client sends one request),
+    and anything else falls back to one embed_query call per text.
+    """
+    batched = getattr(embeddings_model, "embed_queries", None)
+    if callable(batched):
+        return batched(texts)
+    client = getattr(embeddings_model, "client", None)
+    query_instruction = getattr(embeddings_model, "query_instruction", None)
+    if client is not None and query_instruction is not None:
+        encode_kwargs = getattr(embeddings_model, "encode_kwargs", None) or {}
+        vectors = client.encode([[query_instruction, text] for text in texts], **encode_kwargs)
+        return [list(map(float, v)) for v in vectors]
+    if isinstance(embeddings_model, OnnxEmbeddings) or type(embeddings_model).__name__ == "HuggingFaceEmbeddings":
+        return embeddings_model.embed_documents(texts)
+    return [embeddings_model.embed_query(text) for text in texts]
+
+def model_identity(embeddings_model) -> str:
+    """
+    Identify the model behind an embeddings object, including anything that
+    changes its vectors (such as ONNX quantization or the model a shared
+    embedding service currently serves). Objects may define identity().
+    """
+    identity = getattr(embeddings_model, "identity", None)
+    if callable(identity):
+        return identity()
+    name = getattr(embeddings_model, "model_name", None) or getattr(embeddings_model, "url", None)
+    return f"{type(embeddings_model).__name__}:{name or ''}"
+
+def remember_dimension(embeddings_model, vector: List[float]) -> None:
+    """
+    Record the dimension of a vector produced by a model. It is updated on
+    every call because a shared embedding service may restart with another model.
+    """
+    key = id(embeddings_model)
+    if _dimensions.get(key) != len(vector):
+        with _dimensions_lock:
+            _dimensions[key] = len(vector)
+
+def embedding_dimension(embeddings_model) -> int:
+    """
+    Return the output dimension of a model, detected from a previous
+    embedding, a dimension attribute or a probe embedding
+    """
+    key = id(embeddings_model)
+    if key in _dimensions:
+        return _dimensions[key]
+
+    dimension = getattr(embeddings_model, "dimension", None)
+    if dimension is None:
+        try:
+            dimension = len(embeddings_model.embed_query("dimension probe"))
+        except Exception as e:
+            print(f"Could not detect embedding dimension: {e}")
+            return FALLBACK_DIMENSION
+
+    with _dimensions_lock:
+        _dimensions[key] = dimension
+    return dimension
@@ -0,0 +1,286 @@
+import argparse
+import http.client
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from embedding_backends import EMBEDDING_BACKEND, embed_queries, embedding_dimension, load_embeddings, model_identity
+
+# Shared embedding service for multi-worker deployments. One process owns
+# the embedding model; uvicorn workers send texts over a Unix socket or
+# localhost HTTP and requests from all workers are micro-batched together.
+#
+#   python embedding_service.py --socket /tmp/resume-embeddings.sock
+#   EMBEDDING_SERVICE_URL=unix:///tmp/resume-embeddings.sock uvicorn main:app --workers 4
+MAX_BATCH_SIZE = int(os.environ.get("EMBEDDING_SERVICE_MAX_BATCH", 64))
+MAX_WAIT_MS = float(os.environ.get("EMBEDDING_SERVICE_MAX_WAIT_MS", 10))
+CLIENT_TIMEOUT_SECONDS = float(os.environ.get("EMBEDDING_SERVICE_TIMEOUT", 120))
+
+class MicroBatcher:
+    """
+    Collects embedding requests from many callers and runs them through the
+    model in batches. A batch is dispatched as soon as it holds max_batch
+    texts or max_wait_ms has passed since its first request arrived.
+    """
+
+    def __init__(self, embeddings_model, max_batch: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS):
+        self.model = embeddings_model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[Tuple[str, List[str], Future]]" = queue.Queue()
+        self._stats = {"requests": 0, "texts": 0, "batches": 0}
+        self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, kind: str, texts: List[str]) -> Future:
+        """Queue texts ("query" or "documents") and return a future for their vectors"""
+        future: Future = Future()
+        self._queue.put((kind, texts, future))
+        return future
+
+    def stats(self) -> Dict[str, float]:
+        stats = dict(self._stats)
+        stats["mean_batch_size"] = stats["texts"] / stats["batches"] if stats["batches"] else 0.0
+        return stats
+
+    def _collect(self) -> List[Tuple[str, List[str], Future]]:
+        first = self._queue.get()
+        batch = [first]
+        size = len(first[1])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            size += len(item[1])
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            self._stats["requests"] += len(batch)
+            self._stats["batches"] += 1
+            # Queries and documents may be embedded differently (e.g. instructor
+            # instructions), so each kind is run as its own model call
+            for kind in ("query", "documents"):
+                items = [item for item in batch if item[0] == kind]
+                if not items:
+                    continue
+                texts = [text for _, item_texts, _ in items for text in item_texts]
+                self._stats["texts"] += len(texts)
+                try:
+                    if kind == "query":
+                        vectors = embed_queries(self.model, texts)
+                    else:
+                        vectors = self.model.embed_documents(texts)
+                except Exception as e:
+                    for _, _, future in items:
+                        future.set_exception(e)
+                    continue
+                offset = 0
+                for _, item_texts, future in items:
+                    future.set_result([list(map(float, v)) for v in vectors[offset:offset + len(item_texts)]])
+                    offset += len(item_texts)
+
+class EmbeddingRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /embed  {"kind": "query" | "documents", "texts": [...]} -> {"embeddings": [...]}
+    GET  /health -> service status, model, dimension and batching statistics
+    Both responses carry "model", the identity of the served model, so
+    clients notice when the service restarts with a different one.
+    """
+
+    batcher: MicroBatcher = None
+    model_name = ""
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"detail": "Not found"})
+            return
+        self._send_json(200, {
+            "status": "ok",
+            "model": self.model_name,
+            "dimension": embedding_dimension(self.batcher.model),
+            **self.batcher.stats()
+        })
+
+    def do_POST(self):
+        if self.path != "/embed":
+            self._send_json(404, {"detail": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            kind = request.get("kind", "documents")
+            texts = request["texts"]
+            if kind not in ("query", "documents") or not isinstance(texts, list):
+                raise ValueError("Expected kind 'query' or 'documents' and a list of texts")
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {"detail": str(e)})
+            return
+
+        try:
+            vectors = self.batcher.submit(kind, texts).result()
+        except Exception as e:
+            self._send_json(500, {"detail": f"Embedding failed: {e}"})
+            return
+        self._send_json(200, {"model": self.model_name, "embeddings": vectors})
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        pass
+
+class EmbeddingHTTPServer(ThreadingHTTPServer):
+    # Every uvicorn worker may connect at once; the socketserver default is 5
+    request_queue_size = 128
+    daemon_threads = True
+
+class UnixHTTPServer(EmbeddingHTTPServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        self.socket.bind(self.server_address)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+class EmbeddingServiceClient:
+    """
+    Client for the shared embedding service, with the same embed_query and
+    embed_documents interface as the in-process embedding models
+    """
+
+    def __init__(self, url: str, timeout: float = CLIENT_TIMEOUT_SECONDS):
+        self.url = url
+        self.timeout = timeout
+        self.service_model: Optional[str] = None
+        parsed = urlparse(url)
+        if parsed.scheme == "unix":
+            self._socket_path = parsed.path
+            self._address: Optional[Tuple[str, int]] = None
+        elif parsed.scheme == "http":
+            self._socket_path = None
+            self._address = (parsed.hostname or "127.0.0.1", parsed.port or 80)
+        else:
+            raise ValueError(f"Unsupported embedding service URL '{url}' (use unix:// or http://)")
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._socket_path:
+            return UnixHTTPConnection(self._socket_path, self.timeout)
+        return http.client.HTTPConnection(*self._address, timeout=self.timeout)
+
+    def identity(self) -> str:
+        """The model the service currently serves, as last reported by it"""
+        if self.service_model is None:
+            try:
+                self.health()
+            except Exception:
+                # Unreachable: embedding will fail too, and failed vectors are never cached
+                return f"EmbeddingServiceClient:{self.url}"
+        return f"EmbeddingServiceClient:{self.service_model}"
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        connection = self._connection()
+        try:
+            body = json.dumps(payload).encode("utf-8") if payload is not None else None
+            headers = {"Content-Type": "application/json"} if body else {}
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = json.loads(response.read() or b"{}")
+        finally:
+            connection.close()
+        if response.status != 200:
+            raise RuntimeError(f"Embedding service error {response.status}: {data.get('detail')}")
+        if "model" in data:
+            self.service_model = data["model"]
+        return data
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        return self._request("POST", "/embed", {"kind": "documents", "texts": texts})["embeddings"]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._request("POST", "/embed", {"kind": "query", "texts": [text]})["embeddings"][0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """Embed several queries in one request, so the service batches them together"""
+        if not texts:
+            return []
+        return self._request("POST", "/embed", {"kind": "query", "texts": texts})["embeddings"]
+
+    def health(self) -> Dict[str, Any]:
+        return self._request("GET", "/health")
+
+def serve(embeddings_model, socket_path: Optional[str] = None, host: str = "127.0.0.1", port: int = 8765,
+          max_batch: int = MAX_BATCH_SIZE, max_wait_ms: float = MAX_WAIT_MS):
+    """Create (but do not start) the embedding service server"""
+    handler = type("Handler", (EmbeddingRequestHandler,), {
+        "batcher": MicroBatcher(embeddings_model, max_batch, max_wait_ms),
+        "model_name": model_identity(embeddings_model),
+    })
+    if socket_path:
+        return UnixHTTPServer(socket_path, handler)
+    return EmbeddingHTTPServer((host, port), handler)
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared embedding service for resume screening workers")
+    parser.add_argument("--socket", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--backend", default=EMBEDDING_BACKEND, help="Embedding backend to load")
+    parser.add_argument("--model", help="Model id or path (default depends on the backend)")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    print(f"Loading {args.backend} embeddings...")
+    model = load_embeddings(args.backend, args.model)
+    server = serve(model, args.socket, args.host, args.port, args.max_batch, args.max_wait_ms)
+    where = f"unix://{args.socket}" if args.socket else f"http://{args.host}:{args.port}"
+    print(f"Embedding service listening on {where}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: every process runs its own janitor
+    fcntl = None
+
+from blob_store import BLOB_DIRNAME, TEXT_SUFFIX, blob_lock, blob_root, read_session_manifest, remove_blob
+
+# Eviction policy, configurable through environment variables
+SESSION_TTL_SECONDS = int(os.environ.get("SESSION_TTL_SECONDS", 24 * 3600))
+REPORT_TTL_SECONDS = int(os.environ.get("REPORT_TTL_SECONDS", 7 * 24 * 3600))
+SESSION_QUOTA_BYTES = int(os.environ.get("SESSION_QUOTA_BYTES", 2 * 1024 ** 3))
+REPORT_QUOTA_BYTES = int(os.environ.get("REPORT_QUOTA_BYTES", 512 * 1024 ** 2))
+JANITOR_INTERVAL_SECONDS = int(os.environ.get("JANITOR_INTERVAL_SECONDS", 600))
+# Blobs younger than this are kept even when unreferenced, so an upload that
+# has stored its blobs but not yet written its manifest is never collected
+BLOB_GRACE_SECONDS = int(os.environ.get("BLOB_GRACE_SECONDS", 300))
+
+# Sessions being uploaded to or screened hold a lease file named
+# <LEASE_PREFIX><pid>-<id>, visible to every worker process. Leases of
+# processes that no longer exist are ignored and removed.
+LEASE_PREFIX = ".inflight-"
+# Sessions are renamed to <TOMBSTONE_PREFIX><id> before deletion
+TOMBSTONE_PREFIX = ".evicting-"
+# Held by the one worker process whose janitor is running
+JANITOR_LOCK_FILENAME = ".janitor.lock"
+
+_lock = threading.Lock()
+
+_metrics: Dict[str, float] = {
+    "runs_total": 0,
+    "last_run_timestamp": 0.0,
+    "last_run_duration_seconds": 0.0,
+    "sessions_evicted_total": 0,
+    "reports_evicted_total": 0,
+    "blobs_evicted_total": 0,
+    "session_bytes_reclaimed_total": 0,
+    "report_bytes_reclaimed_total": 0,
+    "blob_bytes_reclaimed_total": 0,
+    "cache_entries_pruned_total": 0,
+    "session_bytes": 0,
+    "report_bytes": 0,
+    "blob_bytes": 0,
+}
+
+@contextmanager
+def session_in_use(session_dir: str):
+    """
+    Mark a session as in flight so no worker's janitor will evict it
+    """
+    lease = os.path.join(session_dir, f"{LEASE_PREFIX}{os.getpid()}-{uuid.uuid4().hex}")
+    open(lease, "w").close()
+    try:
+        yield
+    finally:
+        try:
+            os.remove(lease)
+        except OSError:
+            pass  # The session was removed by the request itself
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # Exists but belongs to another user
+    return True
+
+def _session_leased(session_dir: str) -> bool:
+    """Whether a live process holds a lease on the session"""
+    leased = False
+    try:
+        names = os.listdir(session_dir)
+    except OSError:
+        return False
+    for name in names:
+        if not name.startswith(LEASE_PREFIX):
+            continue
+        try:
+            pid = int(name[len(LEASE_PREFIX):].split("-", 1)[0])
+        except ValueError:
+            continue
+        if _process_alive(pid):
+            leased = True
+        else:
+            # Left behind by a worker that died mid-request
+            try:
+                os.remove(os.path.join(session_dir, name))
+            except OSError:
+                pass
+    return leased
+
+def touch(path: str) -> None:
+    """Record an access so LRU eviction sees the item as recently used"""
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+def get_metrics() -> Dict[str, float]:
+    """Return a snapshot of the janitor counters and gauges"""
+    with _lock:
+        return dict(_metrics)
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def _blob_size(blob_file: str) -> int:
+    total = 0
+    for path in (blob_file, f"{blob_file}{TEXT_SUFFIX}"):
+        if os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+def _is_session_dir(entry: os.DirEntry) -> bool:
+    # Skips the blob store and sessions being deleted
+    return entry.is_dir() and entry.name != BLOB_DIRNAME and not entry.name.startswith(".")
+
+def _referenced_blobs(upload_dir: str) -> Set[str]:
+    """Blob paths referenced by any session manifest currently on disk"""
+    referenced: Set[str] = set()
+    for entry in os.scandir(upload_dir):
+        if _is_session_dir(entry):
+            referenced |= {item["path"] for item in read_session_manifest(entry.path) or [] if "digest" in item}
+    return referenced
+
+def _blob_last_used(blob_file: str) -> Optional[float]:
+    try:
+        return os.stat(blob_file).st_mtime
+    except OSError:
+        return None
+
+def _list_sessions(upload_dir: str) -> List[Dict[str, Any]]:
+    """
+    Return every session with its last-used time, own size and referenced blobs
+    """
+    sessions = []
+    for entry in os.scandir(upload_dir):
+        if not _is_session_dir(entry):
+            continue
+        manifest = read_session_manifest(entry.path) or []
+        blobs = {item["path"] for item in manifest if "digest" in item}
+        sessions.append({
+            "id": entry.name,
+            "path": entry.path,
+            "last_used": entry.stat().st_mtime,
+            "size": _dir_size(entry.path),
+            "blobs": blobs,
+        })
+    return sessions
+
+def _list_blobs(upload_dir: str) -> List[Tuple[str, float, int]]:
+    """Return (path, last_used, size) for every stored blob"""
+    blobs = []
+    root = blob_root(upload_dir)
+    if not os.path.exists(root):
+        return blobs
+    for fan_dir in os.scandir(root):
+        if not fan_dir.is_dir():
+            continue
+        for entry in os.scandir(fan_dir.path):
+            if entry.name.endswith(TEXT_SUFFIX) or entry.name.endswith(".tmp"):
+                continue
+            blobs.append((entry.path, entry.stat().st_mtime, _blob_size(entry.path)))
+    return blobs
+
+def _evict_session(session: Dict[str, Any]) -> bool:
+    """Delete a session directory unless a request holds a lease on it"""
+    if _session_leased(session["path"]):
+        return False
+    # Renaming is atomic, so a lease taken just before it is found by the
+    # second check and the session is put back; after it, new requests
+    # no longer see the session
+    tombstone = os.path.join(os.path.dirname(session["path"]), f"{TOMBSTONE_PREFIX}{session['id']}")
+    try:
+        os.rename(session["path"], tombstone)
+    except OSError:
+        return False
+    if _session_leased(tombstone):
+        os.rename(tombstone, session["path"])
+        return False
+    shutil.rmtree(tombstone, ignore_errors=True)
+    return True
+
+def collect_sessions(upload_dir: str, ttl: int = None, quota: int = None,
+                     now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Evict expired sessions, then least-recently-used sessions until the
+    upload directory fits its quota, then blobs no session references
+    """
+    ttl = SESSION_TTL_SECONDS if ttl is None else ttl
+    quota = SESSION_QUOTA_BYTES if quota is None else quota
+    now = time.time() if now is None else now
+    stats = {"sessions_evicted": 0, "session_bytes": 0, "blobs_evicted": 0, "blob_bytes": 0}
+
+    if not os.path.exists(upload_dir):
+        return stats
+
+    # Deletions interrupted by a crash
+    for entry in os.scandir(upload_dir):
+        if entry.is_dir() and entry.name.startswith(TOMBSTONE_PREFIX):
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    sessions = sorted(_list_sessions(upload_dir), key=lambda s: s["last_used"])
+    blobs = _list_blobs(upload_dir)
+    blob_sizes = {path: size for path, _, size in blobs}
+
+    def usage(live_sessions):
+        referenced: Set[str] = set()
+        for s in live_sessions:
+            referenced |= s["blobs"]
+        return (sum(s["size"] for s in live_sessions)
+                + sum(blob_sizes.get(path, 0) for path in referenced))
+
+    live = []
+    for session in sessions:
+        if now - session["last_used"] > ttl and _evict_session(session):
+            stats["sessions_evicted"] += 1
+            stats["session_bytes"] += session["size"]
+        else:
+            live.append(session)
+
+    # Oldest first; in-flight sessions are skipped rather than evicted
+    for session in list(live):
+        if usage(live) <= quota:
+            break
+        if _evict_session(session):
+            live.remove(session)
+            stats["sessions_evicted"] += 1
+            stats["session_bytes"] += session["size"]
+
+    referenced: Set[str] = set()
+    for session in live:
+        referenced |= session["blobs"]
+    candidates = [(path, last_used) for path, last_used, _ in blobs
+                  if path not in referenced and now - last_used >= BLOB_GRACE_SECONDS]
+    if candidates:
+        # Uploads may have deduplicated against a candidate since the snapshot:
+        # re-read the manifests and, under the blob lock, re-stat each blob,
+        # keeping any that was refreshed in the meantime
+        referenced = _referenced_blobs(upload_dir)
+        for path, listed_last_used in candidates:
+            if path in referenced:
+                continue
+            with blob_lock(upload_dir):
+                last_used = _blob_last_used(path)
+                if last_used != listed_last_used:
+                    continue
+                reclaimed = remove_blob(path)
+            stats["blobs_evicted"] += 1
+            stats["blob_bytes"] += reclaimed
+
+    return stats
+
+def collect_reports(reports_dir: str, ttl: int = None, quota: int = None,
+                    now: Optional[float] = None) -> Dict[str, int]:
+    """
+    Evict expired reports, then least-recently-used reports until the
+    reports directory fits its quota
+    """
+    ttl = REPORT_TTL_SECONDS if ttl is None else ttl
+    quota = REPORT_QUOTA_BYTES if quota is None else quota
+    now = time.time() if now is None else now
+    stats = {"reports_evicted": 0, "report_bytes": 0}
+
+    if not os.path.exists(reports_dir):
+        return stats
+
+    reports = sorted(
+        ((entry.path, entry.stat().st_mtime, entry.stat().st_size)
+         for entry in os.scandir(reports_dir) if entry.is_file()),
+        key=lambda r: r[1]
+    )
+    total = sum(size for _, _, size in reports)
+
+    for path, last_used, size in reports:
+        if now - last_used <= ttl and total <= quota:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        stats["reports_evicted"] += 1
+        stats["report_bytes"] += size
+
+    return stats
+
+def run_once(upload_dir: str, reports_dir: str, cache=None) -> Dict[str, int]:
+    """
+    Run a single collection pass and update the exported metrics.
+    cache is a ScreeningCache whose expired entries are pruned as well.
+    """
+    start = time.time()
+    stats = collect_sessions(upload_dir)
+    stats.update(collect_reports(reports_dir))
+    stats["cache_entries_pruned"] = cache.prune() if cache is not None else 0
+    duration = time.time() - start
+
+    with _lock:
+        _metrics["runs_total"] += 1
+        _metrics["last_run_timestamp"] = start
+        _metrics["last_run_duration_seconds"] = duration
+        _metrics["sessions_evicted_total"] += stats["sessions_evicted"]
+        _metrics["reports_evicted_total"] += stats["reports_evicted"]
+        _metrics["blobs_evicted_total"] += stats["blobs_evicted"]
+        _metrics["session_bytes_reclaimed_total"] += stats["session_bytes"]
+        _metrics["report_bytes_reclaimed_total"] += stats["report_bytes"]
+        _metrics["blob_bytes_reclaimed_total"] += stats["blob_bytes"]
+        _metrics["cache_entries_pruned_total"] += stats["cache_entries_pruned"]
+        _metrics["session_bytes"] = sum(
+            _dir_size(entry.path) for entry in os.scandir(upload_dir) if _is_session_dir(entry)
+        ) if os.path.exists(upload_dir) else 0
+        _metrics["blob_bytes"] = _dir_size(blob_root(upload_dir))
+        _metrics["report_bytes"] = _dir_size(reports_dir)
+
+    return stats
+
+class Janitor:
+    """
+    Background thread that periodically garbage-collects sessions, reports
+    and (when given one) expired screening cache entries.
+    With several worker processes, only the one holding the janitor lock
+    collects; the others keep trying so one takes over if it exits.
+    """
+
+    def __init__(self, upload_dir: str, reports_dir: str, interval: int = None, cache=None):
+        self.upload_dir = upload_dir
+        self.reports_dir = reports_dir
+        self.cache = cache
+        self.interval = JANITOR_INTERVAL_SECONDS if interval is None else interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock_file = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="janitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._lock_file is not None:
+            # Closing the file releases the lock for another worker
+            self._lock_file.close()
+            self._lock_file = None
+
+    def _is_leader(self) -> bool:
+        """Take the janitor lock if no other process holds it"""
+        if fcntl is None or self._lock_file is not None:
+            return True
+        os.makedirs(self.upload_dir, exist_ok=True)
+        lock_file = open(os.path.join(self.upload_dir, JANITOR_LOCK_FILENAME), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self._is_leader():
+                    run_once(self.upload_dir, self.reports_dir, self.cache)
+            except Exception as e:
+                print(f"Error during storage cleanup: {e}")
+            self._stop.wait(self.interval)
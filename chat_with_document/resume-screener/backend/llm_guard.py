@@ -0,0 +1,256 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Latency SLO for LLM calls, configurable through environment variables:
+#   LLM_CALL_TIMEOUT_SECONDS   - give up on a single call after this long
+#   LLM_SLOW_CALL_SECONDS      - successful calls slower than this count as failures
+#   LLM_BREAKER_FAILURES       - consecutive failures that open the circuit
+#   LLM_BREAKER_RESET_SECONDS  - how long the circuit stays open before a trial call
+#   LLM_BATCH_BUDGET_SECONDS   - total LLM time one screening batch may spend (0 = unlimited)
+#   LLM_MAX_CONCURRENCY        - LLM calls in flight at once
+LLM_CALL_TIMEOUT_SECONDS = float(os.environ.get("LLM_CALL_TIMEOUT_SECONDS", 20))
+LLM_SLOW_CALL_SECONDS = float(os.environ.get("LLM_SLOW_CALL_SECONDS", 10))
+LLM_BREAKER_FAILURES = int(os.environ.get("LLM_BREAKER_FAILURES", 5))
+LLM_BREAKER_RESET_SECONDS = float(os.environ.get("LLM_BREAKER_RESET_SECONDS", 60))
+LLM_BATCH_BUDGET_SECONDS = float(os.environ.get("LLM_BATCH_BUDGET_SECONDS", 300))
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", 8))
+
+class LLMUnavailableError(Exception):
+    """The LLM was not called, or its answer was not waited for"""
+
+class CircuitOpenError(LLMUnavailableError):
+    pass
+
+class LLMTimeoutError(LLMUnavailableError):
+    pass
+
+class BudgetExhaustedError(LLMUnavailableError):
+    pass
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed    - calls go through; failures (including slow calls) are counted
+    open      - calls are rejected immediately until reset_seconds have passed
+    half_open - one trial call is let through; its outcome closes or reopens the circuit
+
+    Every trip starts a new generation. Calls are admitted with the current
+    generation and outcomes from an earlier one are ignored, so a slow call
+    admitted before a trip cannot close the circuit when it finally succeeds.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = LLM_BREAKER_FAILURES,
+                 reset_seconds: float = LLM_BREAKER_RESET_SECONDS,
+                 slow_call_seconds: float = LLM_SLOW_CALL_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._generation = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self._metrics = {"trips_total": 0, "rejected_total": 0, "failures_total": 0, "timeouts_total": 0}
+
+    def allow(self) -> Optional[int]:
+        """
+        Admit a call if one may be made now, returning the generation to
+        pass to record(); None means the call is rejected
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.CLOSED:
+                return self._generation
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return self._generation
+            self._metrics["rejected_total"] += 1
+            return None
+
+    def allow_shared(self) -> bool:
+        """
+        Whether a caller may wait on a call already in flight. Such callers
+        make no call of their own, so they do not take the half-open trial
+        and their outcomes are not recorded.
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at < self.reset_seconds:
+                self._metrics["rejected_total"] += 1
+                return False
+            return True
+
+    def record(self, generation: int, seconds: float, error: Optional[BaseException] = None) -> None:
+        """Record the outcome of a call that allow() admitted in the given generation"""
+        failed = error is not None or seconds > self.slow_call_seconds
+        with self._lock:
+            if isinstance(error, LLMTimeoutError):
+                self._metrics["timeouts_total"] += 1
+            if failed:
+                self._metrics["failures_total"] += 1
+            if generation != self._generation:
+                # Admitted before the last trip; the circuit has moved on
+                return
+            # Only the trial call is admitted in the current generation while half open
+            self._trial_in_flight = False
+            if not failed:
+                self._failures = 0
+                self.state = self.CLOSED
+                return
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._metrics["trips_total"] += 1
+                self._generation += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def release(self, generation: int) -> None:
+        """
+        Give back an admission without recording an outcome, for calls
+        abandoned for reasons that say nothing about the LLM's health
+        """
+        with self._lock:
+            if generation == self._generation:
+                self._trial_in_flight = False
+
+    def get_metrics(self) -> Dict[str, float]:
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["open"] = int(self.state == self.OPEN)
+            metrics["consecutive_failures"] = self._failures
+        return metrics
+
+class Budget:
+    """LLM time allowance for one screening batch"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.spent = 0.0
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        with self._lock:
+            return self.seconds - self.spent
+
+    def spend(self, seconds: float) -> None:
+        with self._lock:
+            self.spent += seconds
+
+# Shared by every request in the process
+breaker = CircuitBreaker()
+_executor = ThreadPoolExecutor(max_workers=LLM_MAX_CONCURRENCY, thread_name_prefix="llm")
+_budget: ContextVar[Optional[Budget]] = ContextVar("llm_budget", default=None)
+_budget_set: ContextVar[bool] = ContextVar("llm_budget_set", default=False)
+# Provider calls in flight by key, so identical concurrent prompts share one
+_in_flight: Dict[Hashable, Future] = {}
+_in_flight_lock = threading.Lock()
+_shared_calls = 0
+
+@contextmanager
+def batch_budget(seconds: float = LLM_BATCH_BUDGET_SECONDS):
+    """
+    Limit the LLM time spent by everything inside the block.
+    Yields the Budget, or None when seconds is 0 (unlimited). Inside an
+    enclosing batch_budget block the enclosing budget (limited or not)
+    stays in force, so callers can set the budget for code that opens its own.
+    """
+    if _budget_set.get():
+        yield _budget.get()
+        return
+    budget = Budget(seconds) if seconds > 0 else None
+    token = _budget.set(budget)
+    set_token = _budget_set.set(True)
+    try:
+        yield budget
+    finally:
+        _budget_set.reset(set_token)
+        _budget.reset(token)
+
+def _forget(key: Hashable, future: Future) -> None:
+    with _in_flight_lock:
+        if _in_flight.get(key) is future:
+            del _in_flight[key]
+
+def invoke(llm, prompt: str, key: Optional[Hashable] = None,
+           timeout: float = LLM_CALL_TIMEOUT_SECONDS) -> Tuple[Any, bool]:
+    """
+    Call llm.invoke under the circuit breaker, a per-call timeout and the
+    current batch budget. Raises LLMUnavailableError instead of waiting when
+    the circuit is open, the budget is spent or the call times out; the
+    caller is expected to fall back to a local path.
+
+    Callers passing the same key while a call is in flight wait on that call
+    instead of making their own. Only the provider call is shared: each
+    caller checks its own budget and the breaker and waits at most its own
+    timeout. Returns the response and whether it came from a shared call.
+    """
+    global _shared_calls
+    budget = _budget.get()
+    clamped = False
+    if budget is not None:
+        remaining = budget.remaining()
+        if remaining <= 0:
+            raise BudgetExhaustedError("LLM time budget for this batch is spent")
+        clamped = remaining < timeout
+        timeout = min(timeout, remaining)
+
+    generation = None
+    with _in_flight_lock:
+        future = _in_flight.get(key) if key is not None else None
+        shared = future is not None
+        if shared:
+            if not breaker.allow_shared():
+                raise CircuitOpenError("LLM circuit breaker is open")
+            _shared_calls += 1
+        else:
+            generation = breaker.allow()
+            if generation is None:
+                raise CircuitOpenError("LLM circuit breaker is open")
+            future = _executor.submit(llm.invoke, prompt)
+            if key is not None:
+                _in_flight[key] = future
+    if key is not None and not shared:
+        future.add_done_callback(lambda done: _forget(key, done))
+
+    start = time.monotonic()
+    error: Optional[BaseException] = None
+    try:
+        # A timed-out call keeps running in its worker but is no longer waited for
+        return future.result(timeout=timeout), shared
+    except FutureTimeoutError:
+        if clamped:
+            # The batch ran out of time, not the LLM: nothing to tell the breaker
+            error = BudgetExhaustedError(f"LLM time budget for this batch ran out after {timeout:.1f}s")
+        else:
+            error = LLMTimeoutError(f"LLM call exceeded {timeout:.1f}s")
+        raise error
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        elapsed = time.monotonic() - start
+        # Only the caller that made the call reports it to the breaker
+        if generation is not None:
+            if isinstance(error, BudgetExhaustedError):
+                breaker.release(generation)
+            else:
+                breaker.record(generation, elapsed, error)
+        if budget is not None:
+            budget.spend(elapsed)
+
+def get_metrics() -> Dict[str, float]:
+    """Circuit breaker counters and state, and how many callers shared a call"""
+    metrics = breaker.get_metrics()
+    with _in_flight_lock:
+        metrics["shared_calls_total"] = _shared_calls
+    return metrics
@@ -1,17 +1,31 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
-from typing import List, Optional
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import Iterator, List, Optional
 import os
+import sys
 import shutil
 import uuid
 import json
+import threading
+from contextlib import closing
 from datetime import datetime
 
 # Import processor modules
-from document_processor import extract_text_from_resume, extract_text_from_jd
-from screening_engine import screen_resumes
-from report_generator import generate_report
+from document_processor import extract_text_from_resume, extract_text_from_jd, extract_text_from_blob
+from blob_store import store_blob, write_session_manifest, read_session_manifest
+from janitor import Janitor, session_in_use, touch, get_metrics as get_janitor_metrics
+from metrics import span, collect_timings, register_collector, render_prometheus
+from screening_cache import ScreeningCache, SCREENING_CACHE_PATH, text_hash
+from results_store import ResultsStore, RESULTS_DB_PATH
+from pipeline import SCREENING_TOP_K, STORE_BATCH_SIZE, STREAM_QUEUE_SIZE, TopK, prefetch
+from llm_guard import get_metrics as get_llm_breaker_metrics
+from singleflight import SingleFlight, get_metrics as get_singleflight_metrics
+# screening_engine and report_generator pull in langchain, the embedding
+# stack and the LLM clients; they are imported lazily so the server can
+# bind and answer liveness probes before the models are loaded.
 
 app = FastAPI(title="Resume Screening API")
 
@@ -23,6 +37,8 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Result pages and JSON reports compress well
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
 # Create temp directory for file uploads
 UPLOAD_DIR = "temp_uploads"
@@ -30,10 +46,77 @@ REPORTS_DIR = "generated_reports"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 os.makedirs(REPORTS_DIR, exist_ok=True)
 
+# State of the circuit breaker that guards LLM calls
+register_collector("llm_breaker", get_llm_breaker_metrics)
+
+# Identical screenings requested while one is running (same job description
+# and resume contents) share the running one's result
+screening_flight = SingleFlight("screening")
+matrix_flight = SingleFlight("matrix")
+register_collector("singleflight", get_singleflight_metrics)
+
+# Stored requirement matches, embeddings and summaries make re-screening after
+# a job description edit incremental; set SCREENING_CACHE_PATH="" to disable
+screening_cache = ScreeningCache(SCREENING_CACHE_PATH) if SCREENING_CACHE_PATH else None
+
+# Background garbage collector for expired sessions, blobs, reports and cache entries
+janitor = Janitor(UPLOAD_DIR, REPORTS_DIR, cache=screening_cache)
+register_collector("janitor", get_janitor_metrics)
+
+# Screening results are persisted so they can be paged and revisited
+results_store = ResultsStore(RESULTS_DB_PATH)
+
+# Load models in the background at startup unless PRELOAD_MODELS=false,
+# in which case they are loaded by the first screening request
+PRELOAD_MODELS = os.environ.get("PRELOAD_MODELS", "true").lower() in ("1", "true", "yes")
+readiness = {"ready": False, "error": None}
+
+def preload_models():
+    """
+    Import the screening stack and load the shared models
+    """
+    try:
+        import report_generator  # noqa: F401
+        from screening_engine import load_models
+        load_models()
+        readiness["ready"] = True
+        readiness["error"] = None
+    except Exception as e:
+        print(f"Error preloading models: {e}")
+        readiness["error"] = str(e)
+
+@app.on_event("startup")
+async def startup_event():
+    janitor.start()
+    if PRELOAD_MODELS:
+        threading.Thread(target=preload_models, name="model-preload", daemon=True).start()
+
 @app.get("/")
 async def root():
     return {"message": "Resume Screening API"}
 
+@app.get("/healthz")
+async def healthz():
+    """
+    Liveness probe: the process is up and serving requests
+    """
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness probe: the screening models are loaded
+    """
+    # Models may also have been loaded by a screening request (PRELOAD_MODELS=false)
+    if not readiness["ready"] and "screening_engine" in sys.modules:
+        readiness["ready"] = sys.modules["screening_engine"].models_loaded()
+    if readiness["ready"]:
+        return {"status": "ready"}
+    return JSONResponse(
+        status_code=503,
+        content={"status": "loading" if readiness["error"] is None else "error", "error": readiness["error"]}
+    )
+
 @app.post("/upload-job-description")
 async def upload_job_description(job_description: str = Form(...)):
     """
@@ -58,68 +141,306 @@ async def upload_resumes(resumes: List[UploadFile] = File(...)):
     session_dir = os.path.join(UPLOAD_DIR, session_id)
     os.makedirs(session_dir, exist_ok=True)
     
-    saved_files = []
-    for resume in resumes:
-        if not (resume.filename.endswith('.pdf') or resume.filename.endswith('.docx')):
-            continue  # Skip invalid file types
-        
-        file_path = os.path.join(session_dir, resume.filename)
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(resume.file, buffer)
-        saved_files.append({"filename": resume.filename, "path": file_path})
+    with session_in_use(session_dir):
+        saved_files = []
+        for resume in resumes:
+            if not (resume.filename.endswith('.pdf') or resume.filename.endswith('.docx')):
+                continue  # Skip invalid file types
+        
+            # Store the content once under its hash; the session only keeps a reference
+            extension = os.path.splitext(resume.filename)[1]
+            blob = store_blob(UPLOAD_DIR, resume.file, extension)
+            saved_files.append({
+                "filename": resume.filename,
+                "digest": blob["digest"],
+                "path": blob["path"],
+                "deduplicated": blob["deduplicated"]
+            })
+        
+        if not saved_files:
+            shutil.rmtree(session_dir, ignore_errors=True)
+            raise HTTPException(status_code=400, detail="No valid resume files uploaded (PDF/DOCX only)")
+        
+        write_session_manifest(session_dir, saved_files)
+        
+    return {"message": f"{len(saved_files)} resume(s) uploaded successfully", "session_id": session_id, "files": saved_files}
+
+def session_manifest(session_dir: str) -> List[dict]:
+    """
+    List the resumes of an upload session
+    """
+    # Sessions created by /upload-resumes reference blobs through a manifest;
+    # older sessions still hold the uploaded files directly
+    manifest = read_session_manifest(session_dir)
+    if manifest is None:
+        manifest = [
+            {"filename": filename, "path": os.path.join(session_dir, filename)}
+            for filename in os.listdir(session_dir)
+            if filename.endswith('.pdf') or filename.endswith('.docx')
+        ]
     
-    if not saved_files:
-        raise HTTPException(status_code=400, detail="No valid resume files uploaded (PDF/DOCX only)")
+    if not manifest:
+        raise HTTPException(status_code=400, detail="No resume files found in session")
+    return manifest
+
+def iter_session_resumes(manifest: List[dict]) -> Iterator[dict]:
+    """
+    Extract resume texts one at a time, so a caller never holds more of
+    them than it needs
+    """
+    for entry in manifest:
+        if "digest" in entry:
+            resume_text = extract_text_from_blob(entry["path"])
+        else:
+            resume_text = extract_text_from_resume(entry["path"])
+        yield {
+            "filename": entry["filename"],
+            "digest": entry.get("digest"),
+            "text": resume_text
+        }
+
+def load_session_resumes(session_dir: str) -> List[dict]:
+    """
+    Extract the text of every resume in an upload session
+    """
+    return list(iter_session_resumes(session_manifest(session_dir)))
+
+def screening_key(manifest: List[dict], *parts) -> str:
+    """
+    Content key of a screening job: the resumes' names and digests (blob
+    paths for legacy sessions) plus whatever else determines its result
+    """
+    resumes = [(entry["filename"], entry.get("digest") or entry["path"]) for entry in manifest]
+    return text_hash(json.dumps([resumes, *parts]))
+
+def run_screening(session_id: str, manifest: List[dict], job_description: str,
+                  job_id: Optional[str]) -> dict:
+    """
+    Screen a session's resumes, store the results and write the report.
+    Runs in a worker thread; returns everything the response is built from.
+    """
+    with collect_timings() as timings:
+        from screening_engine import screen_resumes_stream
+        from report_generator import generate_report
+        
+        requirements_diff = None
+        if job_id and screening_cache is not None:
+            requirements = extract_text_from_jd(job_description)["requirements"]
+            requirements_diff = screening_cache.update_job_requirements(job_id, requirements)
+        
+        # Extraction runs ahead of scoring through a bounded queue; scored
+        # results are written to the results store in batches and only the
+        # top SCREENING_TOP_K are kept in memory for the report and response
+        screening_id = results_store.begin_screening(job_description, job_id=job_id, session_id=session_id)
+        top_results = TopK(SCREENING_TOP_K)
+        pending: List[dict] = []
+        stored = 0
+        resumes = prefetch(iter_session_resumes(manifest), STREAM_QUEUE_SIZE)
+        try:
+            with span("screen_resumes"), closing(resumes):
+                for result in screen_resumes_stream(job_description, resumes, cache=screening_cache, job_id=job_id):
+                    top_results.push(result["match_score"], result)
+                    pending.append(result)
+                    if len(pending) >= STORE_BATCH_SIZE:
+                        results_store.add_results(screening_id, pending, stored)
+                        stored += len(pending)
+                        pending = []
+                results_store.add_results(screening_id, pending, stored)
+                stored += len(pending)
+        except Exception as e:
+            print(f"Error in screening resumes: {e}")
+            results_store.delete_screening(screening_id)
+            raise HTTPException(status_code=500, detail=f"Failed to screen resumes: {e}")
+        screening_results = top_results.items()
+        
+        # Generate report
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        report_filename = f"screening_report_{timestamp}_{screening_id[:8]}.pdf"
+        report_path = os.path.join(REPORTS_DIR, report_filename)
+        
+        with span("report"):
+            generate_report(screening_results, job_description, report_path, total_count=stored)
+        report_url = f"/download-report/{report_filename}"
+        
+        with span("store_results"):
+            results_store.finish_screening(screening_id, report_url)
     
-    return {"message": f"{len(saved_files)} resume(s) uploaded successfully", "session_id": session_id, "files": saved_files}
+    return {
+        "screening_id": screening_id,
+        "result_count": stored,
+        "report_url": report_url,
+        "results": screening_results,
+        "requirements_diff": requirements_diff,
+        "timings": timings
+    }
 
 @app.post("/screen-resumes")
 async def screen_resumes_endpoint(
     session_id: str = Form(...),
-    job_description: str = Form(...)
+    job_description: str = Form(...),
+    job_id: Optional[str] = Form(None),
+    include_results: bool = Form(True),
+    include_timings: bool = Form(False)
 ):
     """
-    Screen uploaded resumes against job description
+    Screen uploaded resumes against job description.
+    Results are stored under the returned screening_id and the response
+    carries at most the top SCREENING_TOP_K of them (none if include_results
+    is false); page through the rest with /screenings/{screening_id}/results.
+    Pass the same job_id when re-screening an edited job description to get
+    the requirement changes back and reuse unchanged summaries.
+    Set include_timings to attach a per-stage timing breakdown to the response.
+    A request identical to one already running (same job description, job_id
+    and resume contents) waits for that screening and shares its result,
+    which the response marks as coalesced.
     """
     session_dir = os.path.join(UPLOAD_DIR, session_id)
     
     if not os.path.exists(session_dir):
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Get all resume files in the session directory
-    resume_files = []
-    for filename in os.listdir(session_dir):
-        if filename.endswith('.pdf') or filename.endswith('.docx'):
-            resume_files.append(os.path.join(session_dir, filename))
-    
-    if not resume_files:
-        raise HTTPException(status_code=400, detail="No resume files found in session")
-    
-    # Process resumes
-    resumes_data = []
-    for file_path in resume_files:
-        filename = os.path.basename(file_path)
-        resume_text = extract_text_from_resume(file_path)
-        resumes_data.append({
-            "filename": filename,
-            "text": resume_text
-        })
-    
-    # Screen resumes against job description
-    screening_results = screen_resumes(job_description, resumes_data)
+    with session_in_use(session_dir):
+        touch(session_dir)
+        
+        manifest = session_manifest(session_dir)
+        
+        # Screening blocks on extraction, models and SQLite, so it runs in a
+        # worker thread to keep the event loop free for other requests
+        key = screening_key(manifest, job_description, job_id)
+        outcome, coalesced = await run_in_threadpool(
+            screening_flight.do, key, run_screening, session_id, manifest, job_description, job_id
+        )
+        
+        response = {
+            "message": "Screening completed successfully",
+            "screening_id": outcome["screening_id"],
+            "result_count": outcome["result_count"],
+            "report_url": outcome["report_url"],
+            "coalesced": coalesced
+        }
+        if include_results:
+            # The best SCREENING_TOP_K results; the rest are paged from the store
+            response["results"] = outcome["results"]
+        if outcome["requirements_diff"] is not None:
+            response["job_id"] = job_id
+            response["requirements_diff"] = outcome["requirements_diff"]
+        if include_timings:
+            # Timings of the screening that produced the result, shared when coalesced
+            response["timings"] = outcome["timings"]
+        return response
+
+def run_screen_matrix(session_dir: str, job_descriptions: List[str], include_summaries: bool) -> dict:
+    """Extract a session's resumes and screen them against several JDs in a worker thread"""
+    with collect_timings() as timings:
+        resumes_data = load_session_resumes(session_dir)
+        
+        from screening_engine import screen_matrix
+        
+        try:
+            with span("screen_matrix"):
+                matrix = screen_matrix(job_descriptions, resumes_data, include_summaries=include_summaries)
+        except Exception as e:
+            print(f"Error in matrix screening: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to screen resumes: {e}")
+    return {"matrix": matrix, "timings": timings}
+
+@app.post("/screen-matrix")
+async def screen_matrix_endpoint(
+    session_id: str = Form(...),
+    job_descriptions: List[str] = Form(...),
+    include_summaries: bool = Form(False),
+    include_timings: bool = Form(False)
+):
+    """
+    Screen uploaded resumes against several job descriptions at once.
+    Returns a ranked list per job description and the best-fit job for each
+    candidate. Summaries are skipped unless include_summaries is set, in which
+    case one is written per candidate for their best-fit job. Identical
+    concurrent requests share one computation.
+    """
+    job_descriptions = [jd for jd in job_descriptions if jd.strip()]
+    if not job_descriptions:
+        raise HTTPException(status_code=400, detail="At least one job description is required")
     
-    # Generate report
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    report_filename = f"screening_report_{timestamp}.pdf"
-    report_path = os.path.join(REPORTS_DIR, report_filename)
+    session_dir = os.path.join(UPLOAD_DIR, session_id)
     
-    generate_report(screening_results, job_description, report_path)
+    if not os.path.exists(session_dir):
+        raise HTTPException(status_code=404, detail="Session not found")
     
-    return {
-        "message": "Screening completed successfully",
-        "results": screening_results,
-        "report_url": f"/download-report/{report_filename}"
-    }
+    with session_in_use(session_dir):
+        touch(session_dir)
+        
+        key = screening_key(session_manifest(session_dir), job_descriptions, include_summaries)
+        outcome, coalesced = await run_in_threadpool(
+            matrix_flight.do, key, run_screen_matrix, session_dir, job_descriptions, include_summaries
+        )
+        
+        response = {
+            "message": "Matrix screening completed successfully",
+            "coalesced": coalesced,
+            **outcome["matrix"]
+        }
+        if include_timings:
+            response["timings"] = outcome["timings"]
+        return response
+
+@app.get("/screenings")
+async def list_screenings(
+    job_id: Optional[str] = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    status: str = "done"
+):
+    """
+    List past screenings, newest first, optionally for one job.
+    Only finished screenings are listed unless status=running is passed.
+    """
+    try:
+        return results_store.list_screenings(job_id, offset, limit, status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/screenings/{screening_id}")
+async def get_screening(screening_id: str):
+    """
+    Get a past screening's job description, report and result count
+    """
+    screening = results_store.get_screening(screening_id)
+    if screening is None:
+        raise HTTPException(status_code=404, detail="Screening not found")
+    return screening
+
+@app.get("/screenings/{screening_id}/results")
+async def get_screening_results(
+    screening_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    sort_by: str = "match_score",
+    order: str = "desc",
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None,
+    min_match_rate: Optional[float] = None,
+    requirement: Optional[str] = None,
+    include_details: bool = True
+):
+    """
+    Page through a screening's results with sorting and filtering.
+    requirement keeps only candidates who matched that requirement;
+    include_details=false drops requirement analyses and summaries.
+    """
+    screening = results_store.get_screening(screening_id)
+    if screening is None:
+        raise HTTPException(status_code=404, detail="Screening not found")
+    if screening["status"] != "done":
+        # Results are still arriving and their ranks are provisional
+        raise HTTPException(status_code=409, detail="Screening has not finished")
+    try:
+        return results_store.query_results(
+            screening_id, offset, limit, sort_by, order, min_score, max_score,
+            min_match_rate, requirement, include_details
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/download-report/{filename}")
 async def download_report(filename: str):
@@ -130,6 +451,7 @@ async def download_report(filename: str):
     
     if not os.path.exists(report_path):
         raise HTTPException(status_code=404, detail="Report not found")
+    touch(report_path)
     
     return FileResponse(
         path=report_path, 
@@ -137,19 +459,31 @@ async def download_report(filename: str):
         media_type="application/pdf"
     )
 
+@app.get("/storage-stats")
+async def storage_stats():
+    """
+    Report disk usage and bytes reclaimed by the background janitor
+    """
+    return get_janitor_metrics()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Expose pipeline latency, token, cache and storage metrics for Prometheus
+    """
+    return render_prometheus()
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """
-    Clean up temporary files on shutdown
+    Stop the janitor and close the stores
     """
-    # In production, you might want a more sophisticated cleanup strategy
-    # e.g., cleaning files older than X days
-    try:
-        if os.path.exists(UPLOAD_DIR):
-            shutil.rmtree(UPLOAD_DIR)
-        os.makedirs(UPLOAD_DIR, exist_ok=True)
-    except Exception as e:
-        pass  # Fail silently on shutdown
+    # Uploads are shared with other workers and outlive this process;
+    # expired sessions and reports are collected by the janitor
+    janitor.stop()
+    if screening_cache is not None:
+        screening_cache.close()
+    results_store.close()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,175 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Latency buckets (seconds) shared by every stage histogram
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    def __init__(self, name: str, help_text: str, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[LabelKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._values.setdefault(
+                key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._values.items()):
+                for bound, count in zip(self.buckets, series["counts"]):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', str(bound)))} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+STAGE_DURATION = Histogram(
+    "screening_stage_duration_seconds", "Time spent in each screening pipeline stage")
+STAGE_ERRORS = Counter(
+    "screening_stage_errors_total", "Errors raised or handled in each screening pipeline stage")
+LLM_TOKENS = Counter(
+    "screening_llm_tokens_total", "LLM tokens used, by stage and kind (prompt/completion)")
+CACHE_REQUESTS = Counter(
+    "screening_cache_requests_total", "Cache lookups, by cache and result (hit/miss)")
+
+_metrics: List[Any] = [STAGE_DURATION, STAGE_ERRORS, LLM_TOKENS, CACHE_REQUESTS]
+# Callables returning {name: value} gauges from other modules (e.g. the janitor)
+_collectors: List[Tuple[str, Callable[[], Dict[str, float]]]] = []
+
+# Per-request timing breakdown, populated only inside collect_timings()
+_breakdown: ContextVar[Optional[Dict[str, Dict[str, float]]]] = ContextVar("breakdown", default=None)
+
+def register_collector(prefix: str, collect: Callable[[], Dict[str, float]]) -> None:
+    """Expose the values returned by collect() as gauges named <prefix>_<key>"""
+    _collectors.append((prefix, collect))
+
+def _record(stage: str, duration: float, error: bool = False) -> None:
+    STAGE_DURATION.observe(duration, stage=stage)
+    if error:
+        STAGE_ERRORS.inc(stage=stage)
+    breakdown = _breakdown.get()
+    if breakdown is not None:
+        entry = breakdown.setdefault(stage, {"count": 0, "total_seconds": 0.0, "errors": 0})
+        entry["count"] += 1
+        entry["total_seconds"] += duration
+        if error:
+            entry["errors"] += 1
+
+@contextmanager
+def span(stage: str):
+    """
+    Time a block as one occurrence of a pipeline stage.
+    Exceptions are counted as stage errors and re-raised.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        _record(stage, time.perf_counter() - start, error=True)
+        raise
+    _record(stage, time.perf_counter() - start)
+
+def record_tokens(stage: str, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+    """Count LLM tokens used by a stage"""
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, stage=stage, kind="prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, stage=stage, kind="completion")
+    breakdown = _breakdown.get()
+    if breakdown is not None:
+        entry = breakdown.setdefault(stage, {"count": 0, "total_seconds": 0.0, "errors": 0})
+        entry["prompt_tokens"] = entry.get("prompt_tokens", 0) + prompt_tokens
+        entry["completion_tokens"] = entry.get("completion_tokens", 0) + completion_tokens
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup"""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+    breakdown = _breakdown.get()
+    if breakdown is not None:
+        entry = breakdown.setdefault(f"cache:{cache}", {"hits": 0, "misses": 0})
+        entry["hits" if hit else "misses"] += 1
+
+@contextmanager
+def collect_timings():
+    """
+    Collect a per-stage breakdown of everything timed inside the block.
+    Yields the dict being filled in.
+    """
+    breakdown: Dict[str, Dict[str, float]] = {}
+    token = _breakdown.set(breakdown)
+    try:
+        yield breakdown
+    finally:
+        _breakdown.reset(token)
+
+def render_prometheus() -> str:
+    """Render every metric in the Prometheus text exposition format"""
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for prefix, collect in _collectors:
+        try:
+            values = collect()
+        except Exception as e:
+            print(f"Error collecting {prefix} metrics: {e}")
+            continue
+        for key, value in sorted(values.items()):
+            name = f"{prefix}_{key}"
+            lines.append(f"# TYPE {name} {'counter' if key.endswith('_total') else 'gauge'}")
+            lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
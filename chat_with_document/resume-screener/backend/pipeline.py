@@ -0,0 +1,99 @@
+import contextvars
+import heapq
+import itertools
+import os
+import queue
+import threading
+from typing import Any, Iterable, Iterator, List, Tuple
+
+# Streaming screening settings:
+#   STREAM_QUEUE_SIZE  - extracted resumes buffered ahead of scoring
+#   STREAM_CHUNK_SIZE  - resumes scored per batched embedding / matrix product
+#   STORE_BATCH_SIZE   - results written to the results store per transaction
+#   SCREENING_TOP_K    - best results kept in memory for the report and response
+STREAM_QUEUE_SIZE = int(os.environ.get("STREAM_QUEUE_SIZE", 64))
+STREAM_CHUNK_SIZE = int(os.environ.get("STREAM_CHUNK_SIZE", 32))
+STORE_BATCH_SIZE = int(os.environ.get("STORE_BATCH_SIZE", 100))
+SCREENING_TOP_K = int(os.environ.get("SCREENING_TOP_K", 100))
+
+_DONE = object()
+
+class _Failure:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+def prefetch(iterable: Iterable[Any], maxsize: int = STREAM_QUEUE_SIZE) -> Iterator[Any]:
+    """
+    Run an iterable in a background thread, buffering at most maxsize items.
+    The producer blocks while the buffer is full, so a slow consumer applies
+    backpressure instead of letting items pile up in memory. Exceptions are
+    re-raised in the consumer, and closing the iterator stops the producer.
+    """
+    buffer: "queue.Queue[Any]" = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put(_Failure(e))
+
+    # Run in a copy of the caller's context so metric spans still land in
+    # the request's timing breakdown
+    context = contextvars.copy_context()
+    thread = threading.Thread(target=context.run, args=(produce,), name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+
+def chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to size items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+class TopK:
+    """
+    Keep the k highest-scoring items seen so far in a min-heap, so ranking
+    a stream needs O(k) memory whatever its length
+    """
+
+    def __init__(self, k: int = SCREENING_TOP_K):
+        self.k = k
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._counter = itertools.count()
+
+    def push(self, score: float, item: Any) -> None:
+        # The counter breaks ties in arrival order without comparing items
+        entry = (score, -next(self._counter), item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry > self._heap[0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self) -> List[Any]:
+        """The kept items, best first"""
+        return [item for _, _, item in sorted(self._heap, reverse=True)]
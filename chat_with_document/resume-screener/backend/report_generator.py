@@ -1,10 +1,10 @@
 import jinja2
 import pdfkit
 import os
-import pandas as pd
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import json
 from datetime import datetime
+from metrics import span
 
 # HTML template for the report
 REPORT_TEMPLATE = """
@@ -97,7 +97,11 @@ REPORT_TEMPLATE = """
         <p>{{ job_description|truncate(300) }}</p>
     </div>
     
+    {% if total_count and total_count > results|length %}
+    <h2>Top {{ results|length }} of {{ total_count }} Candidates</h2>
+    {% else %}
     <h2>Screening Results ({{ results|length }} candidates)</h2>
+    {% endif %}
     
     {% for result in results %}
     <div class="candidate">
@@ -151,9 +155,12 @@ REPORT_TEMPLATE = """
 </html>
 """
 
-def generate_report(screening_results: List[Dict[str, Any]], job_description: str, output_path: str) -> str:
+def generate_report(screening_results: List[Dict[str, Any]], job_description: str, output_path: str,
+                    total_count: Optional[int] = None) -> str:
     """
-    Generate a PDF report of resume screening results
+    Generate a PDF report of resume screening results.
+    When the results are only the top candidates, total_count is the number
+    of resumes screened.
     """
     try:
         # Set up jinja2 template
@@ -163,11 +170,13 @@ def generate_report(screening_results: List[Dict[str, Any]], job_description: st
         report_data = {
             "results": screening_results,
             "job_description": job_description,
+            "total_count": total_count,
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
         # Render the HTML template
-        html_content = template.render(**report_data)
+        with span("report_render"):
+            html_content = template.render(**report_data)
         
         # Save the HTML content to a temporary file
         html_path = f"{output_path}.html"
@@ -178,11 +187,12 @@ def generate_report(screening_results: List[Dict[str, Any]], job_description: st
         try:
             # For Windows, you may need to specify the path to wkhtmltopdf
             config = None
-            if os.name == "nt":  # Windows
-                config = pdfkit.configuration(wkhtmltopdf=r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe")
-                pdfkit.from_file(html_path, output_path, configuration=config)
-            else:
-                pdfkit.from_file(html_path, output_path)
+            with span("report_pdf"):
+                if os.name == "nt":  # Windows
+                    config = pdfkit.configuration(wkhtmltopdf=r"C:\Program Files\wkhtmltopdf\bin\wkhtmltopdf.exe")
+                    pdfkit.from_file(html_path, output_path, configuration=config)
+                else:
+                    pdfkit.from_file(html_path, output_path)
             
             # Clean up the temporary HTML file
             if os.path.exists(html_path):
@@ -212,6 +222,8 @@ def generate_csv_report(screening_results: List[Dict[str, Any]], output_path: st
     """
     Generate a CSV report of resume screening results
     """
+    import pandas as pd
+    
     try:
         # Extract relevant data for CSV
         csv_data = []
@@ -0,0 +1,229 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+# Persistent store of screening results, so past screenings can be paged,
+# sorted and filtered without recomputation or resending the whole batch
+RESULTS_DB_PATH = os.environ.get("RESULTS_DB_PATH", "screening_results.sqlite3")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS screenings (
+    screening_id TEXT PRIMARY KEY,
+    job_id TEXT,
+    session_id TEXT,
+    job_description TEXT NOT NULL,
+    report_url TEXT,
+    result_count INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running'
+);
+CREATE INDEX IF NOT EXISTS screenings_by_job ON screenings (job_id, created_at);
+CREATE TABLE IF NOT EXISTS results (
+    screening_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    match_score REAL NOT NULL,
+    overall_similarity REAL NOT NULL,
+    requirements_match_rate REAL NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (screening_id, rank)
+);
+CREATE INDEX IF NOT EXISTS results_by_score ON results (screening_id, match_score);
+CREATE INDEX IF NOT EXISTS results_by_match_rate ON results (screening_id, requirements_match_rate);
+CREATE TABLE IF NOT EXISTS result_requirements (
+    screening_id TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    requirement TEXT NOT NULL,
+    matched INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS requirements_by_match ON result_requirements (screening_id, requirement, matched);
+"""
+
+# A screening is "running" until finish_screening ranks its results; one
+# whose process died stays running and is left out of listings
+STATUSES = ("running", "done")
+SORT_COLUMNS = ("match_score", "overall_similarity", "requirements_match_rate", "filename")
+# Fields dropped from the compact (include_details=False) result rows
+DETAIL_FIELDS = ("requirements_analysis", "summary")
+
+class ResultsStore:
+    """
+    SQLite store of screenings and their per-resume results, indexed by job
+    and score. One connection is shared by all threads and serialized with a lock.
+    """
+
+    def __init__(self, path: str = RESULTS_DB_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            self._migrate()
+
+    def _migrate(self) -> None:
+        """Add the status column to stores created before it existed"""
+        columns = [row["name"] for row in self._conn.execute("PRAGMA table_info(screenings)")]
+        if "status" in columns:
+            return
+        with self._conn:
+            self._conn.execute("ALTER TABLE screenings ADD COLUMN status TEXT NOT NULL DEFAULT 'done'")
+            # Screenings with provisional ranks never finished
+            self._conn.execute(
+                "UPDATE screenings SET status = 'running' "
+                "WHERE screening_id IN (SELECT screening_id FROM results WHERE rank < 0)"
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def begin_screening(self, job_description: str, job_id: Optional[str] = None,
+                        session_id: Optional[str] = None) -> str:
+        """Register a screening whose results will be added incrementally"""
+        screening_id = str(uuid.uuid4())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO screenings (screening_id, job_id, session_id, job_description, report_url, "
+                "result_count, created_at, status) VALUES (?, ?, ?, ?, ?, ?, ?, 'running')",
+                (screening_id, job_id, session_id, job_description, None, 0, time.time())
+            )
+        return screening_id
+
+    def add_results(self, screening_id: str, results: List[Dict[str, Any]], start: int) -> None:
+        """
+        Append results in arrival order; start is the number of results
+        already added. Ranks are provisional until finish_screening.
+        """
+        result_rows = []
+        requirement_rows = []
+        for index, result in enumerate(results, start):
+            # Provisional ranks are negative so they never collide with final ones
+            rank = -(index + 1)
+            result_rows.append((
+                screening_id, rank, result.get("filename", "Unknown"), result.get("match_score", 0.0),
+                result.get("overall_similarity", 0.0), result.get("requirements_match_rate", 0.0),
+                json.dumps(result)
+            ))
+            for req in result.get("requirements_analysis", []):
+                requirement_rows.append((screening_id, rank, req["requirement"], int(req["match_result"]["matched"])))
+
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", result_rows)
+            self._conn.executemany("INSERT INTO result_requirements VALUES (?, ?, ?, ?)", requirement_rows)
+
+    def finish_screening(self, screening_id: str, report_url: Optional[str] = None) -> int:
+        """
+        Rank the added results by match score (ties keep arrival order),
+        record the report and mark the screening done; returns the number of results
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DROP TABLE IF EXISTS temp.rank_map")
+            self._conn.execute(
+                "CREATE TEMP TABLE rank_map AS SELECT rank AS old_rank, "
+                "ROW_NUMBER() OVER (ORDER BY match_score DESC, rank DESC) - 1 AS new_rank "
+                "FROM results WHERE screening_id = ? AND rank < 0",
+                (screening_id,)
+            )
+            self._conn.execute("CREATE UNIQUE INDEX temp.rank_map_old ON rank_map (old_rank)")
+            for table in ("results", "result_requirements"):
+                self._conn.execute(
+                    f"UPDATE {table} SET rank = (SELECT new_rank FROM rank_map WHERE old_rank = {table}.rank) "
+                    f"WHERE screening_id = ? AND rank < 0",
+                    (screening_id,)
+                )
+            self._conn.execute("DROP TABLE temp.rank_map")
+            count = self._conn.execute(
+                "SELECT COUNT(*) FROM results WHERE screening_id = ?", (screening_id,)
+            ).fetchone()[0]
+            self._conn.execute(
+                "UPDATE screenings SET result_count = ?, report_url = ?, status = 'done' WHERE screening_id = ?",
+                (count, report_url, screening_id)
+            )
+        return count
+
+    def delete_screening(self, screening_id: str) -> None:
+        """Remove a screening and its results, e.g. after it failed part-way"""
+        with self._lock, self._conn:
+            for table in ("result_requirements", "results", "screenings"):
+                self._conn.execute(f"DELETE FROM {table} WHERE screening_id = ?", (screening_id,))
+
+    def get_screening(self, screening_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM screenings WHERE screening_id = ?", (screening_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_screenings(self, job_id: Optional[str] = None, offset: int = 0, limit: int = 20,
+                        status: str = "done") -> Dict[str, Any]:
+        """Past screenings with the given status, newest first, optionally for one job"""
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status '{status}' (expected one of {', '.join(STATUSES)})")
+        clauses, params = ["status = ?"], [status]
+        if job_id:
+            clauses.append("job_id = ?")
+            params.append(job_id)
+        where = "WHERE " + " AND ".join(clauses)
+        columns = "screening_id, job_id, session_id, report_url, result_count, created_at, status"
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM screenings {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM screenings {where} ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return {"total": total, "offset": offset, "limit": limit, "items": [dict(row) for row in rows]}
+
+    def query_results(self, screening_id: str, offset: int = 0, limit: int = 20, sort_by: str = "match_score",
+                      order: str = "desc", min_score: Optional[float] = None, max_score: Optional[float] = None,
+                      min_match_rate: Optional[float] = None, requirement: Optional[str] = None,
+                      include_details: bool = True) -> Dict[str, Any]:
+        """
+        Page through a finished screening's results with server-side sorting
+        and filtering. requirement keeps only candidates who matched that requirement.
+        Ranks are only final once the screening is done; callers check its status.
+        """
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}' (expected one of {', '.join(SORT_COLUMNS)})")
+        if order not in ("asc", "desc"):
+            raise ValueError("order must be 'asc' or 'desc'")
+
+        clauses, params = ["screening_id = ?"], [screening_id]
+        if min_score is not None:
+            clauses.append("match_score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            clauses.append("match_score <= ?")
+            params.append(max_score)
+        if min_match_rate is not None:
+            clauses.append("requirements_match_rate >= ?")
+            params.append(min_match_rate)
+        if requirement:
+            clauses.append(
+                "rank IN (SELECT rank FROM result_requirements "
+                "WHERE screening_id = ? AND requirement = ? AND matched = 1)"
+            )
+            params.extend([screening_id, requirement])
+        where = " AND ".join(clauses)
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM results WHERE {where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                f"SELECT rank, result FROM results WHERE {where} "
+                f"ORDER BY {sort_by} {order.upper()}, rank LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+
+        items = []
+        for row in rows:
+            result = json.loads(row["result"])
+            if not include_details:
+                for field in DETAIL_FIELDS:
+                    result.pop(field, None)
+            result["rank"] = row["rank"] + 1
+            items.append(result)
+        return {"total": total, "offset": offset, "limit": limit, "items": items}
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from embedding_backends import embedding_dimension, model_identity
+
+# Persistent store of screening components so that re-running a screening
+# after a job description edit only evaluates what changed:
+#   requirement_matches  (LLM and prompt, requirement hash, resume hash) -> match result
+#   unit_matrices        (model and dimension, resume units hash) -> per-unit embedding matrix
+#   summaries            (LLM and prompt, job key, resume hash) -> summary and the score it described
+#   jobs                 job_id -> last screened requirement list
+SCREENING_CACHE_PATH = os.environ.get("SCREENING_CACHE_PATH", "screening_cache.sqlite3")
+# Summaries are regenerated only when the match score moves more than this
+SUMMARY_SCORE_THRESHOLD = float(os.environ.get("SUMMARY_SCORE_THRESHOLD", 0.05))
+# Entries older than this are pruned by the janitor
+SCREENING_CACHE_TTL_SECONDS = int(os.environ.get("SCREENING_CACHE_TTL_SECONDS", 30 * 24 * 3600))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS requirement_matches (
+    model TEXT NOT NULL,
+    requirement_hash TEXT NOT NULL,
+    resume_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, requirement_hash, resume_hash)
+);
+CREATE INDEX IF NOT EXISTS requirement_matches_by_age ON requirement_matches (created_at);
+CREATE TABLE IF NOT EXISTS unit_matrices (
+    model TEXT NOT NULL,
+    units_hash TEXT NOT NULL,
+    dimension INTEGER NOT NULL,
+    vectors BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, units_hash)
+);
+CREATE INDEX IF NOT EXISTS unit_matrices_by_age ON unit_matrices (created_at);
+CREATE TABLE IF NOT EXISTS summaries (
+    model TEXT NOT NULL,
+    job_key TEXT NOT NULL,
+    resume_hash TEXT NOT NULL,
+    match_score REAL NOT NULL,
+    summary TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (model, job_key, resume_hash)
+);
+CREATE INDEX IF NOT EXISTS summaries_by_age ON summaries (created_at);
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    requirements TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+# Table -> column holding the time an entry was written
+AGE_COLUMNS = {
+    "requirement_matches": "created_at",
+    "unit_matrices": "created_at",
+    "summaries": "created_at",
+    "jobs": "updated_at",
+}
+
+def text_hash(text: str) -> str:
+    """SHA-256 digest of a text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def requirement_hash(requirement: str) -> str:
+    """Digest of a requirement, ignoring case and whitespace changes"""
+    return text_hash(" ".join(requirement.lower().split()))
+
+def resume_hash(resume_data: Dict[str, Any]) -> str:
+    """The resume's blob digest, or a digest of its text for legacy sessions"""
+    return resume_data.get("digest") or text_hash(resume_data["text"])
+
+def model_key(model) -> str:
+    """Identify a model so outputs of different models never mix"""
+    return model_identity(model)
+
+class ScreeningCache:
+    """
+    SQLite-backed cache of per-requirement matches, unit embeddings and summaries.
+    LLM answers are keyed by a model string identifying the LLM and prompt
+    that produced them. One connection is shared by all threads and
+    serialized with a lock.
+    """
+
+    def __init__(self, path: str = SCREENING_CACHE_PATH, summary_threshold: float = SUMMARY_SCORE_THRESHOLD):
+        self.path = path
+        self.summary_threshold = summary_threshold
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._drop_unkeyed_tables()
+            self._conn.executescript(SCHEMA)
+
+    def _drop_unkeyed_tables(self) -> None:
+        """Drop LLM answer tables from before answers were keyed by model; they refill"""
+        for table in ("requirement_matches", "summaries"):
+            columns = [row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")]
+            if columns and "model" not in columns:
+                self._conn.execute(f"DROP TABLE {table}")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _fetchone(self, query: str, params: tuple) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()
+
+    def _write(self, query: str, params: tuple) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(query, params)
+
+    def get_match(self, model: str, requirement: str, resume_key: str) -> Optional[Dict[str, Any]]:
+        row = self._fetchone(
+            "SELECT result FROM requirement_matches WHERE model = ? AND requirement_hash = ? AND resume_hash = ?",
+            (model, requirement_hash(requirement), resume_key)
+        )
+        return json.loads(row[0]) if row else None
+
+    def put_match(self, model: str, requirement: str, resume_key: str, result: Dict[str, Any]) -> None:
+        self._write(
+            "INSERT OR REPLACE INTO requirement_matches VALUES (?, ?, ?, ?, ?)",
+            (model, requirement_hash(requirement), resume_key, json.dumps(result), time.time())
+        )
+
+    def get_unit_matrix(self, embeddings_model, unit_texts: List[str]) -> Optional[np.ndarray]:
+        """
+        Return the stored embedding matrix (one row per unit) of a resume's
+        units; a matrix of another dimension than the model's is a miss
+        """
+        dimension = embedding_dimension(embeddings_model)
+        row = self._fetchone(
+            "SELECT dimension, vectors FROM unit_matrices WHERE model = ? AND units_hash = ?",
+            (f"{model_key(embeddings_model)}:{dimension}", text_hash("\n".join(unit_texts)))
+        )
+        if not row or row[0] != dimension:
+            return None
+        return np.frombuffer(row[1], dtype=np.float32).reshape(-1, row[0])
+
+    def put_unit_matrix(self, embeddings_model, unit_texts: List[str], matrix: np.ndarray) -> None:
+        matrix = np.asarray(matrix, dtype=np.float32)
+        self._write(
+            "INSERT OR REPLACE INTO unit_matrices VALUES (?, ?, ?, ?, ?)",
+            (f"{model_key(embeddings_model)}:{matrix.shape[1]}", text_hash("\n".join(unit_texts)),
+             matrix.shape[1], matrix.tobytes(), time.time())
+        )
+
+    def get_summary(self, model: str, job_key: str, resume_key: str, match_score: float) -> Optional[str]:
+        """Return the stored summary unless the score has moved past the threshold"""
+        row = self._fetchone(
+            "SELECT match_score, summary FROM summaries WHERE model = ? AND job_key = ? AND resume_hash = ?",
+            (model, job_key, resume_key)
+        )
+        if row and abs(row[0] - match_score) <= self.summary_threshold:
+            return row[1]
+        return None
+
+    def put_summary(self, model: str, job_key: str, resume_key: str, match_score: float, summary: str) -> None:
+        self._write(
+            "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?)",
+            (model, job_key, resume_key, match_score, summary, time.time())
+        )
+
+    def prune(self, ttl: int = None, now: Optional[float] = None) -> int:
+        """Delete entries written more than ttl seconds ago; returns how many"""
+        ttl = SCREENING_CACHE_TTL_SECONDS if ttl is None else ttl
+        cutoff = (time.time() if now is None else now) - ttl
+        removed = 0
+        with self._lock, self._conn:
+            for table, column in AGE_COLUMNS.items():
+                removed += self._conn.execute(f"DELETE FROM {table} WHERE {column} < ?", (cutoff,)).rowcount
+        return removed
+
+    def update_job_requirements(self, job_id: str, requirements: List[str]) -> Dict[str, List[str]]:
+        """
+        Store the requirement list of a job and return how it differs from
+        the one screened last time
+        """
+        row = self._fetchone("SELECT requirements FROM jobs WHERE job_id = ?", (job_id,))
+        previous = json.loads(row[0]) if row else []
+        previous_hashes = {requirement_hash(req) for req in previous}
+        current_hashes = {requirement_hash(req) for req in requirements}
+        self._write(
+            "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?)",
+            (job_id, json.dumps(requirements), time.time())
+        )
+        return {
+            "added": [req for req in requirements if requirement_hash(req) not in previous_hashes],
+            "removed": [req for req in previous if requirement_hash(req) not in current_hashes],
+            "unchanged": [req for req in requirements if requirement_hash(req) in previous_hashes],
+        }
@@ -1,77 +1,282 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
 import re
-from langchain_community.llms import HuggingFaceHub
-from langchain_groq import ChatGroq
-from langchain_community.embeddings import HuggingFaceInstructEmbeddings
 import os
+import threading
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from document_processor import extract_structured_resume_data
+from document_processor import extract_structured_resume_data, split_resume_units
+from metrics import span, record_tokens, record_cache
+from embedding_backends import (EMBEDDING_BACKEND, DEFAULT_MODELS, load_embeddings, embed_queries,
+                                embedding_dimension, remember_dimension)
+from screening_cache import resume_hash, text_hash, model_key
+from pipeline import STREAM_CHUNK_SIZE, chunked
+from singleflight import SingleFlight
+import llm_guard
+
+# Models are loaded once per process and shared by every request.
+# langchain and the LLM clients are imported on first use so that
+# importing this module stays cheap.
+_models: Dict[str, Any] = {}
+_models_lock = threading.Lock()
+
+# Identical embedding batches and resume unit embeddings requested
+# concurrently (e.g. by overlapping screenings) are computed once;
+# identical LLM prompts share a provider call through llm_guard
+embedding_flight = SingleFlight("embedding")
+unit_flight = SingleFlight("resume_units")
 
 # Initialize embedding model
 def get_embeddings_model():
     try:
-        # Try instructor embeddings first
-        return HuggingFaceInstructEmbeddings(model_name="hkunlp/instructor-xl")
+        # Use the configured backend (instructor-xl unless EMBEDDING_BACKEND says otherwise)
+        with span("load_embeddings"):
+            return load_embeddings()
     except Exception as e:
-        print(f"Failed to load instructor embeddings: {e}")
-        # Fall back to another model if needed
-        # You can implement fallback logic here
-        raise
+        print(f"Failed to load {EMBEDDING_BACKEND} embeddings: {e}")
+        if EMBEDDING_BACKEND == "sentence-transformers":
+            raise
+    
+    # Fall back to a small sentence-transformers model
+    print("Falling back to sentence-transformers embeddings")
+    with span("load_embeddings"):
+        return load_embeddings("sentence-transformers", DEFAULT_MODELS["sentence-transformers"])
 
 # Initialize LLM model
 def get_llm():
     # Check if Groq API key is available
     if os.environ.get("GROQ_API_KEY"):
         try:
-            return ChatGroq(model='llama3-70b-8192', temperature=0.3)
+            from langchain_groq import ChatGroq
+            with span("load_llm"):
+                return ChatGroq(model='llama3-70b-8192', temperature=0.3,
+                                timeout=llm_guard.LLM_CALL_TIMEOUT_SECONDS)
         except Exception as e:
             print(f"Failed to initialize Groq LLM: {e}")
     
     # Fall back to Hugging Face model
     try:
+        from langchain_community.llms import HuggingFaceHub
         return HuggingFaceHub(repo_id="google/flan-t5-large", model_kwargs={"temperature": 0.3})
     except Exception as e:
         print(f"Failed to initialize Hugging Face LLM: {e}")
         raise
 
-def get_embedding(text: str, embeddings_model):
-    """Get vector embedding for text"""
+def load_models():
+    """
+    Return the shared embedding model and LLM, loading them on first call
+    """
+    with _models_lock:
+        if "embeddings" not in _models:
+            _models["embeddings"] = get_embeddings_model()
+        if "llm" not in _models:
+            _models["llm"] = get_llm()
+    return _models["embeddings"], _models["llm"]
+
+def models_loaded() -> bool:
+    """Whether load_models has completed"""
+    return "embeddings" in _models and "llm" in _models
+
+def get_embeddings_matrix(texts: List[str], embeddings_model, documents: bool = False) -> np.ndarray:
+    """
+    Embed several texts in one batched call and return them as the
+    L2-normalized rows of a matrix, so dot products are cosine similarities.
+    Texts are embedded as queries unless documents is set.
+    The returned matrix may be shared with concurrent callers; do not modify it.
+    """
+    if not texts:
+        return np.zeros((0, embedding_dimension(embeddings_model)), dtype=np.float32)
+    key = (model_key(embeddings_model), documents, text_hash("\x1f".join(texts)))
+    matrix, _ = embedding_flight.do(key, embed_matrix, texts, embeddings_model, documents)
+    return matrix
+
+def embed_matrix(texts: List[str], embeddings_model, documents: bool) -> np.ndarray:
+    """Embed texts in one call and normalize the rows; failures give zero rows"""
     try:
-        return embeddings_model.embed_query(text)
+        with span("embedding"):
+            if documents:
+                vectors = embeddings_model.embed_documents(texts)
+            else:
+                vectors = embed_queries(embeddings_model, texts)
+            vectors = np.asarray(vectors, dtype=np.float32)
+        remember_dimension(embeddings_model, vectors[0])
     except Exception as e:
-        print(f"Error generating embedding: {e}")
-        # Return a zero vector as fallback (not ideal but prevents crashes)
-        return [0.0] * 768  # Typical embedding size
+        print(f"Error generating embeddings: {e}")
+        # Zero vectors as fallback (not ideal but prevents crashes)
+        vectors = np.zeros((len(texts), embedding_dimension(embeddings_model)), dtype=np.float32)
+    
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+def embed_resume_units(resumes_data: List[Dict[str, Any]], embeddings_model,
+                       cache=None) -> Tuple[List[List[Dict[str, str]]], np.ndarray, np.ndarray]:
+    """
+    Split resumes into section and bullet units and embed them in one batch.
+    
+    Returns the units of each resume, a single normalized matrix holding the
+    units of every resume, and the row offsets delimiting each resume's units
+    (resume i owns rows offsets[i]:offsets[i + 1]). Unit matrices are reused
+    from the cache when one is given, and a resume whose units another
+    request is already embedding waits for that request's matrix.
+    """
+    units = [resume_data.get("units") or split_resume_units(resume_data["text"]) for resume_data in resumes_data]
+    matrices: List[Any] = [None] * len(units)
+    if cache is not None:
+        for i, resume_units in enumerate(units):
+            matrices[i] = cache.get_unit_matrix(embeddings_model, [u["text"] for u in resume_units])
+            record_cache("resume_units", matrices[i] is not None)
+    
+    # Claim every missing resume before embedding any, and publish our own
+    # matrices before waiting on others', so overlapping requests cannot deadlock
+    keys = {}
+    led, waiting = [], []
+    for i, matrix in enumerate(matrices):
+        if matrix is None:
+            keys[i] = (model_key(embeddings_model), text_hash("\n".join(u["text"] for u in units[i])))
+            call, leader = unit_flight.claim(keys[i])
+            (led if leader else waiting).append((i, call))
+    
+    try:
+        if led:
+            embedded = get_embeddings_matrix([u["text"] for i, _ in led for u in units[i]],
+                                             embeddings_model, documents=True)
+            offset = 0
+            for i, _ in led:
+                matrices[i] = embedded[offset:offset + len(units[i])]
+                offset += len(units[i])
+                # Zero rows mean embedding failed; those are not worth keeping
+                if cache is not None and len(units[i]) and np.any(matrices[i]):
+                    cache.put_unit_matrix(embeddings_model, [u["text"] for u in units[i]], matrices[i])
+    except BaseException as e:
+        for i, _ in led:
+            unit_flight.finish(keys[i], error=e)
+        raise
+    for i, _ in led:
+        unit_flight.finish(keys[i], matrices[i])
+    for i, call in waiting:
+        matrices[i] = call.wait()
+    
+    offsets = np.cumsum([0] + [len(resume_units) for resume_units in units])
+    return units, np.vstack(matrices), offsets
 
-def calculate_similarity(vec1, vec2) -> float:
-    """Calculate cosine similarity between two vectors"""
-    # Reshape for sklearn's cosine_similarity
-    vec1_reshaped = np.array(vec1).reshape(1, -1)
-    vec2_reshaped = np.array(vec2).reshape(1, -1)
+def pool_units(unit_matrix: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Mean-pool each resume's unit embeddings into one normalized resume vector"""
+    pooled = np.zeros((len(offsets) - 1, unit_matrix.shape[1]), dtype=np.float32)
+    for i in range(len(offsets) - 1):
+        if offsets[i + 1] > offsets[i]:
+            pooled[i] = unit_matrix[offsets[i]:offsets[i + 1]].mean(axis=0)
+    norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+    return pooled / np.clip(norms, 1e-12, None)
+
+def best_unit_matches(query_matrix: np.ndarray, unit_matrix: np.ndarray, offsets: np.ndarray,
+                      units: List[List[Dict[str, str]]]) -> List[List[Dict[str, Any]]]:
+    """
+    Score every query (e.g. requirement) against every unit of every resume
+    with a single matrix product. For each resume and query, return the
+    similarity of the best-matching unit and that unit as evidence.
+    """
+    with span("unit_scoring"):
+        similarity = query_matrix @ unit_matrix.T
     
-    return float(cosine_similarity(vec1_reshaped, vec2_reshaped)[0][0])
+    matches = []
+    for i, resume_units in enumerate(units):
+        block = similarity[:, offsets[i]:offsets[i + 1]]
+        if not resume_units:
+            matches.append([{"similarity": 0.0, "evidence": None} for _ in range(len(query_matrix))])
+            continue
+        best = block.argmax(axis=1)
+        matches.append([
+            {"similarity": float(block[q, best[q]]), "evidence": resume_units[best[q]]}
+            for q in range(len(query_matrix))
+        ])
+    return matches
 
-def analyze_skill_match(jd_skill: str, resume_skills: List[str], llm) -> Dict[str, Any]:
+def score_units(job_description: str, requirements: List[str], resumes_data: List[Dict[str, Any]],
+                embeddings_model, cache=None, query_matrix: np.ndarray = None) -> List[Dict[str, Any]]:
     """
-    Analyze if a specific JD skill/requirement is matched in the resume skills
-    Uses LLM for semantic matching rather than just keyword matching
+    Semantic scores for a batch of resumes against one job description:
+    the similarity of the JD with each resume's mean-pooled units, and for
+    each requirement the best-matching unit and its similarity.
+    query_matrix may hold the already-embedded [JD] + requirements rows.
     """
-    if not resume_skills:
+    # Queries first, so the model's current dimension is known when cached unit matrices are checked
+    if query_matrix is None:
+        query_matrix = get_embeddings_matrix([job_description] + requirements, embeddings_model)
+    units, unit_matrix, offsets = embed_resume_units(resumes_data, embeddings_model, cache)
+    overall = pool_units(unit_matrix, offsets) @ query_matrix[0]
+    matches = best_unit_matches(query_matrix[1:], unit_matrix, offsets, units)
+    return [
+        {"overall_similarity": float(overall[i]), "requirements": matches[i]}
+        for i in range(len(resumes_data))
+    ]
+
+def llm_predict(llm, prompt: str, stage: str) -> str:
+    """
+    Run a prompt through the LLM as a timed pipeline stage, recording
+    token usage when the provider reports it. The call goes through
+    llm_guard, which raises LLMUnavailableError rather than wait on a slow
+    or failing provider. Concurrent callers with the same model and prompt
+    share one call, whose tokens are recorded once.
+    """
+    with span(stage):
+        response, shared = llm_guard.invoke(llm, prompt, key=(model_key(llm), text_hash(prompt)))
+    
+    # Chat models return a message with usage metadata; plain LLMs return a string
+    text = getattr(response, "content", response)
+    usage = getattr(response, "usage_metadata", None) or {}
+    if not usage:
+        token_usage = (getattr(response, "response_metadata", None) or {}).get("token_usage", {})
+        usage = {
+            "input_tokens": token_usage.get("prompt_tokens", 0),
+            "output_tokens": token_usage.get("completion_tokens", 0)
+        }
+    if not shared:
+        record_tokens(stage, usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+    return text
+
+# The local matcher used without the LLM accepts a requirement whose
+# best-matching resume unit is at least this similar
+FALLBACK_SIMILARITY_THRESHOLD = float(os.environ.get("FALLBACK_SIMILARITY_THRESHOLD", 0.6))
+
+def log_llm_error(message: str, error: Exception) -> None:
+    # An open circuit or spent budget is expected in degraded mode; not worth a line per call
+    if not isinstance(error, (llm_guard.CircuitOpenError, llm_guard.BudgetExhaustedError)):
+        print(f"{message}: {error}")
+
+def fallback_skill_match(jd_skill: str, resume_skills: List[str],
+                         semantic_similarity: float = None) -> Dict[str, Any]:
+    """
+    Match a requirement without the LLM: a keyword hit in the resume skills,
+    or a resume unit whose embedding similarity reaches the threshold
+    """
+    if any(jd_skill.lower() in skill.lower() for skill in resume_skills):
         return {
-            "matched": False,
-            "confidence": 0.0,
-            "explanation": "No skills listed in resume."
+            "matched": True,
+            "confidence": 0.7,
+            "explanation": "Based on direct keyword matching.",
+            "source": "fallback"
         }
-    
-    # Prepare prompt for LLM
-    prompt = f"""
+    if semantic_similarity is not None and semantic_similarity >= FALLBACK_SIMILARITY_THRESHOLD:
+        return {
+            "matched": True,
+            "confidence": float(semantic_similarity),
+            "explanation": f"Based on semantic similarity with the resume ({semantic_similarity:.2f}).",
+            "source": "fallback"
+        }
+    return {
+        "matched": False,
+        "confidence": 0.0,
+        "explanation": "No keyword or semantic match found.",
+        "source": "fallback"
+    }
+
+# Prompt templates. Cached answers are keyed by the template (see answer_model),
+# so editing one invalidates what the old wording produced.
+SKILL_MATCH_PROMPT = """
     Task: Determine if the candidate's skills match the job requirement.
     
-    Job Requirement: {jd_skill}
+    Job Requirement: {requirement}
     
     Candidate Skills:
-    {', '.join(resume_skills)}
+    {skills}
     
     Analyze if the candidate's skills satisfy the job requirement. Consider synonyms and related skills.
     Provide your answer in the following format:
@@ -80,15 +285,57 @@ def analyze_skill_match(jd_skill: str, resume_skills: List[str], llm) -> Dict[st
     Confidence: [0-100]
     Explanation: [Your detailed reasoning]
     """
+
+SUMMARY_PROMPT = """
+    Task: Provide a concise summary of how well a candidate's resume matches a job description.
+    
+    Job Description Summary:
+    {job_description}...
+    
+    Key Requirements:
+    {requirements}
+    
+    Candidate Resume Summary:
+    {resume_text}...
+    
+    Overall Match Score: {match_score:.2f} out of 1.0
+    
+    Provide a 3-5 sentence summary evaluating this candidate's fit for the role. Highlight strengths and weaknesses.
+    """
+
+def answer_model(llm, prompt_template: str) -> str:
+    """Cache key for LLM answers: the model that gave them and the prompt it was asked"""
+    return f"{model_key(llm)}:{text_hash(prompt_template)[:16]}"
+
+def analyze_skill_match(jd_skill: str, resume_skills: List[str], llm,
+                        semantic_similarity: float = None) -> Dict[str, Any]:
+    """
+    Analyze if a specific JD skill/requirement is matched in the resume skills
+    Uses LLM for semantic matching rather than just keyword matching.
+    When the LLM is unavailable the local matcher decides, using
+    semantic_similarity if given. The result's "source" is "llm", "fallback"
+    for the local matcher, or "rule" when no LLM call was needed.
+    """
+    if not resume_skills:
+        return {
+            "matched": False,
+            "confidence": 0.0,
+            "explanation": "No skills listed in resume.",
+            "source": "rule"
+        }
+    
+    # Prepare prompt for LLM
+    prompt = SKILL_MATCH_PROMPT.format(requirement=jd_skill, skills=', '.join(resume_skills))
     
     try:
-        response = llm.predict(prompt)
+        response = llm_predict(llm, prompt, "llm_skill_match")
         
         # Parse the response
         match_result = {
             "matched": False,
             "confidence": 0.0,
-            "explanation": "Could not determine match."
+            "explanation": "Could not determine match.",
+            "source": "llm"
         }
         
         # Extract matched status
@@ -109,19 +356,57 @@ def analyze_skill_match(jd_skill: str, resume_skills: List[str], llm) -> Dict[st
         return match_result
     
     except Exception as e:
-        print(f"Error analyzing skill match with LLM: {e}")
+        log_llm_error("Error analyzing skill match with LLM", e)
         # Fallback to simpler matching
-        simple_match = any(jd_skill.lower() in skill.lower() for skill in resume_skills)
-        return {
-            "matched": simple_match,
-            "confidence": 0.7 if simple_match else 0.0,
-            "explanation": "Based on direct keyword matching."
-        }
+        return fallback_skill_match(jd_skill, resume_skills, semantic_similarity)
+
+def generate_summary(job_description: str, requirements: List[str], resume_text: str, match_score: float,
+                     llm, requirements_analysis: List[Dict[str, Any]] = None) -> Tuple[str, str]:
+    """
+    Summarize how well a resume fits a job description using the LLM.
+    Returns the summary and its source: "llm", or "fallback" for a template
+    summary built from requirements_analysis when the LLM is unavailable.
+    """
+    summary_prompt = SUMMARY_PROMPT.format(
+        job_description=job_description[:500], requirements=', '.join(requirements[:5]),
+        resume_text=resume_text[:500], match_score=match_score
+    )
+    
+    try:
+        return llm_predict(llm, summary_prompt, "llm_summary"), "llm"
+    except Exception as e:
+        log_llm_error("Error generating summary", e)
+        return fallback_summary(match_score, requirements_analysis), "fallback"
+
+def fallback_summary(match_score: float, requirements_analysis: List[Dict[str, Any]] = None) -> str:
+    """Template summary used when the LLM cannot produce one"""
+    summary = f"Match score: {match_score:.2f}. The candidate's profile has been analyzed against the job requirements."
+    if requirements_analysis:
+        matched = [req["requirement"] for req in requirements_analysis if req["match_result"]["matched"]]
+        missing = [req["requirement"] for req in requirements_analysis if not req["match_result"]["matched"]]
+        summary += f" Meets {len(matched)} of {len(requirements_analysis)} key requirements."
+        if matched:
+            summary += f" Strengths: {'; '.join(matched[:3])}."
+        if missing:
+            summary += f" Gaps: {'; '.join(missing[:3])}."
+    return summary
+
+def is_degraded(requirements_analysis: List[Dict[str, Any]], summary_source: str = "llm") -> bool:
+    """Whether any part of a result came from the local fallback path"""
+    return summary_source != "llm" or any(
+        req["match_result"].get("source") == "fallback" for req in requirements_analysis
+    )
 
 def screen_resume(job_description: str, resume_data: Dict[str, Any], 
-                 embeddings_model, llm) -> Dict[str, Any]:
+                 embeddings_model, llm, cache=None, job_key: str = None,
+                 semantic: Dict[str, Any] = None) -> Dict[str, Any]:
     """
-    Screen a single resume against a job description
+    Screen a single resume against a job description.
+    With a ScreeningCache, embeddings and requirement matches stored by an
+    earlier run are reused, and the summary is regenerated only when the
+    score has moved by more than the cache's threshold.
+    semantic holds this resume's score_units result when it was computed
+    for a whole batch.
     """
     # Extract structured data from resume text if not already done
     if "skills" not in resume_data:
@@ -133,20 +418,34 @@ def screen_resume(job_description: str, resume_data: Dict[str, Any],
     from document_processor import extract_text_from_jd
     jd_data = extract_text_from_jd(job_description)
     
-    # Get embeddings for overall job description and resume
-    jd_embedding = get_embedding(job_description, embeddings_model)
-    resume_embedding = get_embedding(resume_data["text"], embeddings_model)
+    # Compare the JD and its requirements with the resume's section and bullet units
+    if semantic is None:
+        semantic = score_units(job_description, jd_data["requirements"], [resume_data], embeddings_model, cache)[0]
+    overall_similarity = semantic["overall_similarity"]
     
-    # Calculate overall similarity
-    overall_similarity = calculate_similarity(jd_embedding, resume_embedding)
-    
-    # Analyze requirements match
+    # Analyze requirements match, evaluating only requirements not seen before
+    resume_key = resume_hash(resume_data) if cache is not None else None
+    # Answers of another LLM or prompt (e.g. the HuggingFaceHub fallback) are not reused
+    match_model = answer_model(llm, SKILL_MATCH_PROMPT) if cache is not None else None
+    requirements_reused = 0
     requirements_analysis = []
-    for req in jd_data["requirements"]:
-        requirement_match = analyze_skill_match(req, resume_structured.get("skills", []), llm)
+    for req, unit_match in zip(jd_data["requirements"], semantic["requirements"]):
+        requirement_match = cache.get_match(match_model, req, resume_key) if cache is not None else None
+        if cache is not None:
+            record_cache("requirement_match", requirement_match is not None)
+        if requirement_match is not None:
+            requirements_reused += 1
+        else:
+            requirement_match = analyze_skill_match(req, resume_structured.get("skills", []), llm,
+                                                    unit_match["similarity"])
+            # Fallback matches are not kept, so the LLM gets another chance next run
+            if cache is not None and requirement_match["source"] != "fallback":
+                cache.put_match(match_model, req, resume_key, requirement_match)
         requirements_analysis.append({
             "requirement": req,
-            "match_result": requirement_match
+            "match_result": requirement_match,
+            "semantic_similarity": unit_match["similarity"],
+            "evidence": unit_match["evidence"]
         })
     
     # Calculate match score (simple weighted approach)
@@ -157,29 +456,19 @@ def screen_resume(job_description: str, resume_data: Dict[str, Any],
     
     match_score = (0.5 * overall_similarity) + (0.5 * requirements_score)
     
-    # Generate summary using LLM
-    summary_prompt = f"""
-    Task: Provide a concise summary of how well a candidate's resume matches a job description.
-    
-    Job Description Summary:
-    {job_description[:500]}...
-    
-    Key Requirements:
-    {', '.join(jd_data["requirements"][:5])}
-    
-    Candidate Resume Summary:
-    {resume_data["text"][:500]}...
-    
-    Overall Match Score: {match_score:.2f} out of 1.0
-    
-    Provide a 3-5 sentence summary evaluating this candidate's fit for the role. Highlight strengths and weaknesses.
-    """
-    
-    try:
-        summary = llm.predict(summary_prompt)
-    except Exception as e:
-        print(f"Error generating summary: {e}")
-        summary = f"Match score: {match_score:.2f}. The candidate's profile has been analyzed against the job requirements."
+    summary = None
+    if cache is not None:
+        job_key = job_key or text_hash(job_description)
+        summary_model = answer_model(llm, SUMMARY_PROMPT)
+        summary = cache.get_summary(summary_model, job_key, resume_key, match_score)
+        record_cache("summary", summary is not None)
+    summary_reused = summary is not None
+    summary_source = "llm"
+    if summary is None:
+        summary, summary_source = generate_summary(job_description, jd_data["requirements"], resume_data["text"],
+                                                   match_score, llm, requirements_analysis)
+        if cache is not None and summary_source == "llm":
+            cache.put_summary(summary_model, job_key, resume_key, match_score, summary)
     
     # Compile final screening result
     screening_result = {
@@ -189,24 +478,61 @@ def screen_resume(job_description: str, resume_data: Dict[str, Any],
         "requirements_match_rate": float(requirements_score),
         "requirements_analysis": requirements_analysis,
         "summary": summary,
+        "summary_source": summary_source,
+        "degraded": is_degraded(requirements_analysis, summary_source),
         "contact_info": resume_structured.get("contact_info", {})
     }
+    if cache is not None:
+        screening_result["incremental"] = {
+            "requirements_reused": requirements_reused,
+            "requirements_evaluated": len(requirements_analysis) - requirements_reused,
+            "summary_reused": summary_reused
+        }
     
     return screening_result
 
-def screen_resumes(job_description: str, resumes_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def screen_resumes_stream(job_description: str, resumes: Iterable[Dict[str, Any]],
+                          embeddings_model=None, llm=None, cache=None, job_id: str = None,
+                          chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
     """
-    Screen multiple resumes against a job description
+    Screen resumes as they arrive, yielding results in input order.
+    Resumes are scored in chunks (one batched embedding call and one matrix
+    product per chunk), so only one chunk of resume texts is held at a time
+    and a slow consumer slows down consumption of the input.
+    The whole stream shares one LLM time budget (see llm_guard).
+    """
+    # Initialize models
+    if embeddings_model is None or llm is None:
+        shared_embeddings, shared_llm = load_models()
+        embeddings_model = embeddings_model or shared_embeddings
+        llm = llm or shared_llm
+    
+    from document_processor import extract_text_from_jd
+    requirements = extract_text_from_jd(job_description)["requirements"]
+    # The JD and its requirements are embedded once for the whole stream
+    query_matrix = get_embeddings_matrix([job_description] + requirements, embeddings_model)
+    
+    # Once the batch has used up its LLM time budget, or the circuit breaker
+    # opens, the remaining resumes are matched and summarized locally
+    with llm_guard.batch_budget():
+        for chunk in chunked(resumes, chunk_size):
+            semantic = score_units(job_description, requirements, chunk, embeddings_model, cache, query_matrix)
+            for resume_data, resume_semantic in zip(chunk, semantic):
+                yield screen_resume(job_description, resume_data, embeddings_model, llm, cache, job_id,
+                                    semantic=resume_semantic)
+
+def screen_resumes(job_description: str, resumes_data: List[Dict[str, Any]],
+                   embeddings_model=None, llm=None, cache=None, job_id: str = None) -> List[Dict[str, Any]]:
+    """
+    Screen multiple resumes against a job description.
+    The shared models are used unless already-initialized ones are passed in.
+    Passing a ScreeningCache makes re-runs incremental; job_id identifies the
+    job across JD edits so stored summaries can be reused.
     """
     try:
-        # Initialize models
-        embeddings_model = get_embeddings_model()
-        llm = get_llm()
-        
-        screening_results = []
-        for resume_data in resumes_data:
-            result = screen_resume(job_description, resume_data, embeddings_model, llm)
-            screening_results.append(result)
+        # The whole list is already in memory, so score it as a single chunk
+        screening_results = list(screen_resumes_stream(job_description, resumes_data, embeddings_model,
+                                                       llm, cache, job_id, chunk_size=max(len(resumes_data), 1)))
         
         # Sort results by match score (descending)
         screening_results.sort(key=lambda x: x["match_score"], reverse=True)
@@ -217,3 +543,128 @@ def screen_resumes(job_description: str, resumes_data: List[Dict[str, Any]]) ->
         print(f"Error in screening resumes: {e}")
         # Return basic error result
         return [{"error": f"Failed to screen resumes: {str(e)}"}]
+
+def screen_matrix(job_descriptions: List[str], resumes_data: List[Dict[str, Any]],
+                  embeddings_model=None, llm=None, include_summaries: bool = False) -> Dict[str, Any]:
+    """
+    Screen one pool of resumes against several job descriptions.
+    
+    Every JD and resume unit is embedded once and the JD x resume similarity
+    matrix is computed in a single matrix product, as are the similarities
+    of every distinct requirement with every resume unit. Resumes are parsed
+    once, and a requirement shared by several JDs is matched against a
+    resume's skills only once. Summaries are optional and, when requested, written
+    only for each candidate's best-fit JD.
+    """
+    if embeddings_model is None or llm is None:
+        shared_embeddings, shared_llm = load_models()
+        embeddings_model = embeddings_model or shared_embeddings
+        llm = llm or shared_llm
+    
+    from document_processor import extract_text_from_jd
+    jds_data = [extract_text_from_jd(jd) for jd in job_descriptions]
+    resumes_structured = [
+        resume_data if "skills" in resume_data else extract_structured_resume_data(resume_data["text"])
+        for resume_data in resumes_data
+    ]
+    
+    # similarity[j, r] is the cosine similarity of JD j and resume r's mean-pooled units
+    jd_matrix = get_embeddings_matrix(job_descriptions, embeddings_model)
+    units, unit_matrix, offsets = embed_resume_units(resumes_data, embeddings_model)
+    with span("similarity_matrix"):
+        similarity = jd_matrix @ pool_units(unit_matrix, offsets).T
+    
+    # Distinct requirements across all JDs against every unit of every resume
+    # (keyed by their normalized form; the first original spelling is embedded,
+    # as screen_resume embeds the original text)
+    requirement_index: Dict[str, int] = {}
+    requirement_texts: List[str] = []
+    for jd_data in jds_data:
+        for req in jd_data["requirements"]:
+            key = " ".join(req.lower().split())
+            if key not in requirement_index:
+                requirement_index[key] = len(requirement_texts)
+                requirement_texts.append(req)
+    requirement_matrix = get_embeddings_matrix(requirement_texts, embeddings_model)
+    unit_matches = best_unit_matches(requirement_matrix, unit_matrix, offsets, units)
+    
+    # Requirement matching depends only on the requirement and the resume's
+    # skills, so it is shared across JDs (and resumes with identical skills).
+    # Fallback matches also depend on the resume's units and are not shared.
+    match_cache: Dict[tuple, Dict[str, Any]] = {}
+    def match_requirement(requirement: str, skills: List[str], semantic_similarity: float) -> Dict[str, Any]:
+        key = (" ".join(requirement.lower().split()), tuple(skills))
+        if key in match_cache:
+            return match_cache[key]
+        match_result = analyze_skill_match(requirement, skills, llm, semantic_similarity)
+        if match_result["source"] != "fallback":
+            match_cache[key] = match_result
+        return match_result
+    
+    # All LLM work of the matrix shares one batch time budget
+    with llm_guard.batch_budget():
+        scores = np.zeros(similarity.shape, dtype=np.float32)
+        cells: List[List[Dict[str, Any]]] = []
+        for j, jd_data in enumerate(jds_data):
+            row = []
+            for r, (resume_data, structured) in enumerate(zip(resumes_data, resumes_structured)):
+                skills = structured.get("skills", [])
+                requirements_analysis = []
+                for req in jd_data["requirements"]:
+                    unit_match = unit_matches[r][requirement_index[" ".join(req.lower().split())]]
+                    requirements_analysis.append({
+                        "requirement": req,
+                        "match_result": match_requirement(req, skills, unit_match["similarity"]),
+                        "semantic_similarity": unit_match["similarity"],
+                        "evidence": unit_match["evidence"]
+                    })
+                matched_requirements = sum(1 for req in requirements_analysis if req["match_result"]["matched"])
+                requirements_score = matched_requirements / (len(requirements_analysis) or 1)
+                overall_similarity = float(similarity[j, r])
+                # Same weighting as screen_resume
+                scores[j, r] = (0.5 * overall_similarity) + (0.5 * requirements_score)
+                row.append({
+                    "filename": resume_data.get("filename", "Unknown"),
+                    "match_score": float(scores[j, r]),
+                    "overall_similarity": overall_similarity,
+                    "requirements_match_rate": float(requirements_score),
+                    "requirements_analysis": requirements_analysis,
+                    "degraded": is_degraded(requirements_analysis),
+                    "contact_info": structured.get("contact_info", {})
+                })
+            cells.append(row)
+        
+        candidates = []
+        for r, resume_data in enumerate(resumes_data):
+            best_jd = int(np.argmax(scores[:, r])) if len(jds_data) else None
+            candidate = {
+                "filename": resume_data.get("filename", "Unknown"),
+                "best_fit_job": best_jd,
+                "best_fit_score": float(scores[best_jd, r]) if best_jd is not None else 0.0,
+                "scores": [float(score) for score in scores[:, r]]
+            }
+            if include_summaries and best_jd is not None:
+                best_cell = cells[best_jd][r]
+                candidate["summary"], candidate["summary_source"] = generate_summary(
+                    job_descriptions[best_jd], jds_data[best_jd]["requirements"],
+                    resume_data["text"], candidate["best_fit_score"], llm, best_cell["requirements_analysis"]
+                )
+                best_cell["summary"] = candidate["summary"]
+                best_cell["summary_source"] = candidate["summary_source"]
+                best_cell["degraded"] = is_degraded(best_cell["requirements_analysis"], candidate["summary_source"])
+            candidates.append(candidate)
+    
+    jobs = []
+    for j, jd_data in enumerate(jds_data):
+        jobs.append({
+            "job_index": j,
+            "requirements": jd_data["requirements"],
+            "results": sorted(cells[j], key=lambda x: x["match_score"], reverse=True)
+        })
+    
+    return {
+        "jobs": jobs,
+        "candidates": candidates,
+        "similarity_matrix": similarity.tolist(),
+        "requirement_matches": len(match_cache)
+    }
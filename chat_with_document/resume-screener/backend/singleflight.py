@@ -0,0 +1,96 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# In-flight deduplication: while a computation for a key is running, other
+# callers asking for the same key wait for its outcome instead of repeating it.
+# Nothing is kept once the computation finishes; persistent reuse is the job
+# of the blob text cache and the screening cache.
+
+class Call:
+    """One in-progress computation that any number of callers can wait on"""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+
+    def resolve(self, value: Any = None, error: Optional[BaseException] = None) -> None:
+        self._value = value
+        self._error = error
+        self._done.set()
+
+    def wait(self) -> Any:
+        """Block until the computation finishes; re-raise its exception"""
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+class SingleFlight:
+    """
+    Group of deduplicated computations, keyed by content hashes.
+
+    The first caller for a key (the leader) runs the computation; callers
+    arriving while it runs share its result or exception. Shared results
+    must be treated as read-only.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, Call] = {}
+        self._lock = threading.Lock()
+        self._metrics = {"leaders_total": 0, "shared_total": 0}
+        _groups.append(self)
+
+    def claim(self, key: Hashable) -> Tuple[Call, bool]:
+        """
+        Return the in-flight call for key and whether the caller leads it.
+        A leader must finish the call with finish(), error or not.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self._metrics["shared_total"] += 1
+                return call, False
+            call = self._calls[key] = Call()
+            self._metrics["leaders_total"] += 1
+            return call, True
+
+    def finish(self, key: Hashable, value: Any = None, error: Optional[BaseException] = None) -> None:
+        """Publish a led call's outcome to its waiters and forget the key"""
+        with self._lock:
+            call = self._calls.pop(key)
+        call.resolve(value, error)
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """
+        Run fn(*args, **kwargs) unless a call for key is already in flight,
+        in which case wait for that one. Returns the value and whether it
+        was shared with another caller.
+        """
+        call, leader = self.claim(key)
+        if not leader:
+            return call.wait(), True
+        try:
+            value = fn(*args, **kwargs)
+        except BaseException as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, value)
+        return value, False
+
+    def get_metrics(self) -> Dict[str, float]:
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["in_flight"] = len(self._calls)
+        return metrics
+
+_groups: List[SingleFlight] = []
+
+def get_metrics() -> Dict[str, float]:
+    """Counters of every group, as <group>_<counter>"""
+    return {
+        f"{group.name}_{key}": value
+        for group in _groups
+        for key, value in group.get_metrics().items()
+    }
@@ -109,6 +109,8 @@ const ResumeUpload = ({
       const formData = new FormData();
       formData.append('session_id', sid);
       formData.append('job_description', jobDescription);
+      // Results are stored server-side and fetched page by page
+      formData.append('include_results', 'false');
       
       const response = await axios.post('/screen-resumes', formData);
       
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import { 
   Box, 
   Typography, 
@@ -19,15 +19,55 @@ import {
   ListItemText,
   Stack,
   Grid,
-  LinearProgress
+  LinearProgress,
+  Pagination,
+  FormControl,
+  InputLabel,
+  Select,
+  MenuItem
 } from '@mui/material';
+import axios from 'axios';
 import ExpandMoreIcon from '@mui/icons-material/ExpandMore';
 import DownloadIcon from '@mui/icons-material/Download';
 import RefreshIcon from '@mui/icons-material/Refresh';
 import CheckCircleIcon from '@mui/icons-material/CheckCircle';
 import CancelIcon from '@mui/icons-material/Cancel';
 
+const PAGE_SIZE = 10;
+
 const ScreeningResults = ({ screeningResults, isLoading, error, onReset }) => {
+  // Stored screenings are fetched one page at a time, sorted and filtered server-side
+  const screeningId = screeningResults?.screening_id;
+  const [page, setPage] = useState(1);
+  const [sortBy, setSortBy] = useState('match_score');
+  const [minScore, setMinScore] = useState('');
+  const [pageData, setPageData] = useState({ total: 0, items: [] });
+  const [pageLoading, setPageLoading] = useState(false);
+  const [pageError, setPageError] = useState(null);
+
+  useEffect(() => {
+    if (!screeningId) return;
+    setPageLoading(true);
+    axios.get(`/screenings/${screeningId}/results`, {
+      params: {
+        offset: (page - 1) * PAGE_SIZE,
+        limit: PAGE_SIZE,
+        sort_by: sortBy,
+        order: sortBy === 'filename' ? 'asc' : 'desc',
+        min_score: minScore === '' ? undefined : minScore
+      }
+    })
+      .then((response) => {
+        setPageData(response.data);
+        setPageError(null);
+      })
+      .catch((err) => {
+        console.error('Error loading results page:', err);
+        setPageError(err.response?.data?.detail || 'Failed to load results.');
+      })
+      .finally(() => setPageLoading(false));
+  }, [screeningId, page, sortBy, minScore]);
+
   // Helper to get color based on match score
   const getScoreColor = (score) => {
     if (score >= 0.7) return 'success';
@@ -79,7 +119,7 @@ const ScreeningResults = ({ screeningResults, isLoading, error, onReset }) => {
     );
   }
 
-  if (!screeningResults || !screeningResults.results) {
+  if (!screeningResults || (!screeningResults.results && !screeningId)) {
     return (
       <Box sx={{ mt: 2 }}>
         <Alert severity="info" sx={{ mb: 3 }}>
@@ -96,6 +136,10 @@ const ScreeningResults = ({ screeningResults, isLoading, error, onReset }) => {
     );
   }
 
+  const results = screeningId ? pageData.items : screeningResults.results;
+  const resultCount = screeningResults.result_count ?? screeningResults.results.length;
+  const filteredCount = screeningId ? pageData.total : results.length;
+
   return (
     <Box sx={{ mt: 1 }}>
       <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', mb: 3 }}>
@@ -124,16 +168,54 @@ const ScreeningResults = ({ screeningResults, isLoading, error, onReset }) => {
       {/* Results Summary */}
       <Paper variant="outlined" sx={{ p: 2, mb: 3 }}>
         <Typography variant="subtitle1" gutterBottom>
-          {screeningResults.results.length} Resume{screeningResults.results.length !== 1 ? 's' : ''} Analyzed
+          {resultCount} Resume{resultCount !== 1 ? 's' : ''} Analyzed
         </Typography>
         <Typography variant="body2" color="text.secondary" paragraph>
           Candidates are ranked by their match score with the job description.
         </Typography>
+        {screeningId && (
+          <Stack direction="row" spacing={2}>
+            <FormControl size="small" sx={{ minWidth: 200 }}>
+              <InputLabel id="sort-by-label">Sort by</InputLabel>
+              <Select
+                labelId="sort-by-label"
+                value={sortBy}
+                label="Sort by"
+                onChange={(e) => { setSortBy(e.target.value); setPage(1); }}
+              >
+                <MenuItem value="match_score">Match score</MenuItem>
+                <MenuItem value="requirements_match_rate">Requirements matched</MenuItem>
+                <MenuItem value="overall_similarity">Overall similarity</MenuItem>
+                <MenuItem value="filename">File name</MenuItem>
+              </Select>
+            </FormControl>
+            <FormControl size="small" sx={{ minWidth: 160 }}>
+              <InputLabel id="min-score-label">Minimum score</InputLabel>
+              <Select
+                labelId="min-score-label"
+                value={minScore}
+                label="Minimum score"
+                onChange={(e) => { setMinScore(e.target.value); setPage(1); }}
+              >
+                <MenuItem value="">Any</MenuItem>
+                <MenuItem value={0.4}>40%</MenuItem>
+                <MenuItem value={0.7}>70%</MenuItem>
+              </Select>
+            </FormControl>
+          </Stack>
+        )}
       </Paper>
 
+      {pageError && (
+        <Alert severity="error" sx={{ mb: 3 }}>
+          {pageError}
+        </Alert>
+      )}
+      {pageLoading && <LinearProgress sx={{ mb: 2 }} />}
+
       {/* Candidate Results */}
-      {screeningResults.results.map((result, index) => (
-        <Card key={index} variant="outlined" sx={{ mb: 3 }}>
+      {results.map((result, index) => (
+        <Card key={result.rank ?? index} variant="outlined" sx={{ mb: 3 }}>
           <CardContent>
             <Grid container spacing={2}>
               <Grid item xs={12} md={8}>
@@ -227,7 +309,11 @@ const ScreeningResults = ({ screeningResults, isLoading, error, onReset }) => {
                             </Typography>
                           </Box>
                         }
-                        secondary={req.match_result.explanation}
+                        secondary={
+                          req.evidence
+                            ? `${req.match_result.explanation} Evidence (${req.evidence.section}): "${req.evidence.text}"`
+                            : req.match_result.explanation
+                        }
                       />
                     </ListItem>
                   ))}
@@ -237,6 +323,17 @@ const ScreeningResults = ({ screeningResults, isLoading, error, onReset }) => {
           </CardContent>
         </Card>
       ))}
+
+      {screeningId && filteredCount > PAGE_SIZE && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+          <Pagination
+            count={Math.ceil(filteredCount / PAGE_SIZE)}
+            page={page}
+            onChange={(e, value) => setPage(value)}
+            color="primary"
+          />
+        </Box>
+      )}
     </Box>
   );
 };